@@ -12,7 +12,10 @@ def main() -> None:
     print("🔍 Iniciando escáner de señales...\n")
 
     engine = SignalEngine()
-    signals = engine.scan_for_signals()
+    try:
+        signals = engine.scan_for_signals()
+    finally:
+        engine.close()
 
     if not signals:
         print("❌ No se detectaron señales válidas en este momento.")
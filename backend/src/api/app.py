@@ -23,3 +23,9 @@ app.include_router(signals.router, prefix="/api/signals", tags=["signals"])
 async def startup_event() -> None:
     """Initialize services on startup."""
     logger.info("Crypto Signal Scanner API startup complete")
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """Release scanner worker processes on shutdown."""
+    signals.engine.close()
@@ -13,3 +13,7 @@ SYMBOLS = [symbol.strip() for symbol in os.getenv("SYMBOLS", "BTC/USDT,ETH/USDT,
 TIMEFRAMES = [tf.strip() for tf in os.getenv("TIMEFRAMES", "1h,4h").split(",") if tf.strip()]
 DEFAULT_LIMIT = int(os.getenv("DEFAULT_LIMIT", "100"))
 DB_PATH = os.getenv("DB_PATH", str(BASE_DIR / "crypto_data.db"))
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "1"))
+CVD_WORKERS = int(os.getenv("CVD_WORKERS", "1"))
+# Directorio para persistir los key levels entre reinicios (vacío = solo caché en memoria).
+KEY_LEVELS_CACHE_DIR = os.getenv("KEY_LEVELS_CACHE_DIR", "")
@@ -124,31 +124,33 @@ class CVDCalculator:
         if timeframe_seconds <= 0:
             raise ValueError(f"Unsupported timeframe: {timeframe}")
 
-        cvd_values: List[float] = []
-
-        for _, row in candles_df.iterrows():
-            timestamp = int(row["timestamp"])
-            candle_start = datetime.utcfromtimestamp(timestamp)
-            candle_end = candle_start + timedelta(seconds=timeframe_seconds)
+        cvd_values = [
+            self._calculate_candle_cvd(symbol, int(timestamp), timeframe_seconds)
+            for timestamp in candles_df["timestamp"]
+        ]
+        return np.array(cvd_values, dtype=float)
 
-            trades = self.fetch_trades_for_timerange(symbol, candle_start, candle_end)
-            period_cvd = self.calculate_cvd_from_trades(trades)
-            cvd_values.append(period_cvd)
+    def _calculate_candle_cvd(self, symbol: str, timestamp: int, timeframe_seconds: int) -> float:
+        candle_start = datetime.utcfromtimestamp(timestamp)
+        candle_end = candle_start + timedelta(seconds=timeframe_seconds)
 
-            self.logger.debug(
-                "Candle @ %s: %s trades, CVD %.4f",
-                candle_start.isoformat(),
-                len(trades),
-                period_cvd,
-            )
+        trades = self.fetch_trades_for_timerange(symbol, candle_start, candle_end)
+        period_cvd = self.calculate_cvd_from_trades(trades)
 
-        return np.array(cvd_values, dtype=float)
+        self.logger.debug(
+            "Candle @ %s: %s trades, CVD %.4f",
+            candle_start.isoformat(),
+            len(trades),
+            period_cvd,
+        )
+        return period_cvd
 
     @staticmethod
     def calculate_cumulative_cvd(cvd_per_candle: np.ndarray) -> np.ndarray:
-        if cvd_per_candle.size == 0:
-            return np.array([], dtype=float)
-        return np.cumsum(cvd_per_candle)
+        values = np.asarray(cvd_per_candle, dtype=np.float64)
+        if values.size == 0:
+            return np.array([], dtype=np.float64)
+        return np.cumsum(values, dtype=np.float64)
 
     @staticmethod
     def _timeframe_to_seconds(timeframe: str) -> int:
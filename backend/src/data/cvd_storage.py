@@ -1,18 +1,36 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import Column, DateTime, Float, Integer, String, UniqueConstraint
+from sqlalchemy import Column, DateTime, Float, Integer, String, UniqueConstraint, inspect, text
+from sqlalchemy.dialects.sqlite import insert
 
 from src.config import settings
 from src.data.data_storage import Base, DataStorage
+from src.utils.checksum import crc32c_rows
 from src.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+# Bytes sobre los que se calcula el checksum de cada fila: (timestamp, cvd_period, cvd_cumulative).
+_CHECKSUM_ROW_DTYPE = np.dtype([("timestamp", "<i8"), ("cvd_period", "<f8"), ("cvd_cumulative", "<f8")])
+
+# Límite conservador de parámetros por sentencia (SQLITE_MAX_VARIABLE_NUMBER antiguo es 999).
+_SQL_IN_CHUNK = 500
+
+
+def cvd_row_checksums(timestamps: np.ndarray, cvd_period: np.ndarray, cvd_cumulative: np.ndarray) -> np.ndarray:
+    """CRC32C of each row's little-endian ``(int64 timestamp, float64 period, float64 cumulative)``."""
+    rows = np.empty(len(timestamps), dtype=_CHECKSUM_ROW_DTYPE)
+    rows["timestamp"] = timestamps
+    rows["cvd_period"] = cvd_period
+    rows["cvd_cumulative"] = cvd_cumulative
+    return crc32c_rows(rows.view(np.uint8).reshape(len(rows), _CHECKSUM_ROW_DTYPE.itemsize))
+
 
 class CVDData(Base):
     """SQLAlchemy model to persist calculated CVD values."""
@@ -25,6 +43,8 @@ class CVDData(Base):
     timestamp = Column(Integer, nullable=False, index=True)
     cvd_period = Column(Float, nullable=False)
     cvd_cumulative = Column(Float, nullable=False)
+    # CRC32C de los valores de la propia fila (ver `cvd_row_checksums`); NULL en filas antiguas.
+    checksum = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (
@@ -37,43 +57,84 @@ class CVDStorage(DataStorage):
 
     def __init__(self, db_path: Optional[str] = None) -> None:
         super().__init__(db_path or settings.DB_PATH)
+        self._ensure_checksum_column()
+
+    def _ensure_checksum_column(self) -> None:
+        # create_all no altera tablas existentes: bases creadas antes de la columna la reciben aquí.
+        columns = {column["name"] for column in inspect(self.engine).get_columns(CVDData.__tablename__)}
+        if "checksum" not in columns:
+            with self.engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE {CVDData.__tablename__} ADD COLUMN checksum INTEGER"))
 
     def save_cvd(
         self,
         symbol: str,
         timeframe: str,
-        timestamps: List[int],
-        cvd_period: List[float],
-        cvd_cumulative: List[float],
+        timestamps: Union[Sequence[int], np.ndarray],
+        cvd_period: Union[Sequence[float], np.ndarray],
+        cvd_cumulative: Union[Sequence[float], np.ndarray],
     ) -> int:
-        if not timestamps:
+        return self.save_cvd_bulk(
+            [
+                {
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "timestamps": timestamps,
+                    "cvd_period": cvd_period,
+                    "cvd_cumulative": cvd_cumulative,
+                }
+            ]
+        )
+
+    def save_cvd_bulk(self, payloads: Sequence[Dict[str, object]]) -> int:
+        """Persist several symbol/timeframe CVD series in a single transaction.
+
+        Each payload carries ``symbol``, ``timeframe``, ``timestamps``, ``cvd_period`` and
+        ``cvd_cumulative``; rows are upserted on (symbol, timeframe, timestamp) together
+        with the CRC32C of their own values.
+        """
+        now = datetime.utcnow()
+        records: List[Dict[str, object]] = []
+        for payload in payloads:
+            timestamps = np.asarray(payload["timestamps"], dtype=np.int64)
+            cvd_period = np.asarray(payload["cvd_period"], dtype=np.float64)
+            cvd_cumulative = np.asarray(payload["cvd_cumulative"], dtype=np.float64)
+            if not (len(timestamps) == len(cvd_period) == len(cvd_cumulative)):
+                raise ValueError("CVD data length mismatch")
+
+            symbol = payload["symbol"]
+            timeframe = payload["timeframe"]
+            checksums = cvd_row_checksums(timestamps, cvd_period, cvd_cumulative)
+            # Un único `tolist()` por columna convierte a int/float nativos (sqlite3 no acepta np.int64).
+            records.extend(
+                {
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "timestamp": ts,
+                    "cvd_period": period_value,
+                    "cvd_cumulative": cumulative_value,
+                    "checksum": checksum,
+                    "created_at": now,
+                }
+                for ts, period_value, cumulative_value, checksum in zip(
+                    timestamps.tolist(), cvd_period.tolist(), cvd_cumulative.tolist(), checksums.tolist()
+                )
+            )
+
+        if not records:
             return 0
-        if not (len(timestamps) == len(cvd_period) == len(cvd_cumulative)):
-            raise ValueError("CVD data length mismatch")
+
+        stmt = insert(CVDData)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["symbol", "timeframe", "timestamp"],
+            set_={col: stmt.excluded[col] for col in ["cvd_period", "cvd_cumulative", "checksum"]},
+        )
 
         session = self.SessionLocal()
         try:
-            records = []
-            for ts, period_value, cumulative_value in zip(timestamps, cvd_period, cvd_cumulative):
-                record = CVDData(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    timestamp=int(ts),
-                    cvd_period=float(period_value),
-                    cvd_cumulative=float(cumulative_value),
-                )
-                records.append(record)
-
-            for record in records:
-                session.merge(record)
-
+            session.execute(stmt, records)
             session.commit()
-            logger.info(
-                "Stored %s CVD rows for %s @ %s",
-                len(records),
-                symbol,
-                timeframe,
-            )
+            logger.info("Stored %s CVD rows across %s series", len(records), len(payloads))
             return len(records)
         except Exception:
             session.rollback()
@@ -81,6 +142,36 @@ class CVDStorage(DataStorage):
         finally:
             session.close()
 
+    def verify_cvd(self, symbol: str, timeframe: str) -> List[int]:
+        """Return the timestamps whose stored values no longer match their checksum.
+
+        Rows written before the checksum column existed (NULL checksum) are skipped.
+        """
+        session = self.SessionLocal()
+        try:
+            rows = (
+                session.query(CVDData.timestamp, CVDData.cvd_period, CVDData.cvd_cumulative, CVDData.checksum)
+                .filter(
+                    CVDData.symbol == symbol,
+                    CVDData.timeframe == timeframe,
+                    CVDData.checksum.isnot(None),
+                )
+                .order_by(CVDData.timestamp)
+                .all()
+            )
+        finally:
+            session.close()
+
+        if not rows:
+            return []
+
+        timestamps = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        cvd_period = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        cvd_cumulative = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+        stored = np.fromiter((row[3] for row in rows), dtype=np.int64, count=len(rows))
+        mismatched = cvd_row_checksums(timestamps, cvd_period, cvd_cumulative) != stored
+        return timestamps[mismatched].tolist()
+
     def get_cvd(self, symbol: str, timeframe: str, limit: int = 100) -> pd.DataFrame:
         session = self.SessionLocal()
         try:
@@ -102,3 +193,45 @@ class CVDStorage(DataStorage):
             return pd.DataFrame(data)
         finally:
             session.close()
+
+    def get_cvd_for_timestamps(self, symbol: str, timeframe: str, timestamps: Sequence[int]) -> np.ndarray:
+        """Return cumulative CVD aligned with ``timestamps`` (NaN where no row exists)."""
+        keys = pd.to_numeric(pd.Series(timestamps), errors="coerce").to_numpy(dtype=float)
+        result = np.full(len(keys), np.nan)
+        valid = np.isfinite(keys)
+        if not valid.any():
+            return result
+
+        valid_keys = keys[valid].astype(np.int64)
+        wanted = np.unique(valid_keys).tolist()
+
+        session = self.SessionLocal()
+        try:
+            rows = []
+            for start in range(0, len(wanted), _SQL_IN_CHUNK):
+                rows.extend(
+                    session.query(CVDData.timestamp, CVDData.cvd_cumulative)
+                    .filter(
+                        CVDData.symbol == symbol,
+                        CVDData.timeframe == timeframe,
+                        CVDData.timestamp.in_(wanted[start : start + _SQL_IN_CHUNK]),
+                    )
+                    .order_by(CVDData.timestamp)
+                    .all()
+                )
+        finally:
+            session.close()
+
+        if not rows:
+            return result
+
+        # Los chunks van en orden ascendente, así que `rows` ya está ordenado por timestamp.
+        found_ts = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        found_cvd = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+        positions = np.minimum(np.searchsorted(found_ts, valid_keys), len(found_ts) - 1)
+        matched = found_ts[positions] == valid_keys
+
+        aligned = np.full(len(valid_keys), np.nan)
+        aligned[matched] = found_cvd[positions[matched]]
+        result[valid] = aligned
+        return result
@@ -6,6 +6,7 @@ from .key_levels import (  # noqa: F401
     KeyLevelsResult,
     calculate_poc,
     calculate_value_area,
+    calculate_volume_profile,
     get_previous_period_extremes,
     get_session_extremes,
 )
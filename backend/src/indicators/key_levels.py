@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -27,13 +27,7 @@ def calculate_poc(
     bins: int = 20,
 ) -> Optional[float]:
     """Calculate the point of control (POC) using a simplified volume profile."""
-    profile = _build_volume_profile(df, window, bins)
-    if profile.empty:
-        return None
-    idx = profile["volume"].idxmax()
-    if idx is None:
-        return None
-    return float(profile.loc[idx, "center"])
+    return calculate_volume_profile(df, (window,), bins)[0]["poc"]
 
 
 def calculate_value_area(
@@ -43,35 +37,99 @@ def calculate_value_area(
     value_area: float = 0.7,
 ) -> Tuple[Optional[float], Optional[float]]:
     """Return the Value Area High (VAH) and Value Area Low (VAL)."""
+    profile = calculate_volume_profile(df, (window,), bins, value_area)[0]
+    return profile["vah"], profile["val"]
+
+
+def calculate_volume_profile(
+    df: pd.DataFrame,
+    windows: Sequence[timedelta],
+    bins: int = 20,
+    value_area: float = 0.7,
+) -> List[Dict[str, Optional[float]]]:
+    """Return POC, VAH and VAL for several trailing windows in a single pass.
+
+    Timestamps, prices and volumes are extracted once and each window only
+    slices those arrays, instead of re-filtering the DataFrame per level.
+    """
     if not 0 < value_area <= 1:
         raise ValueError("value_area must be between 0 and 1")
 
-    profile = _build_volume_profile(df, window, bins)
-    if profile.empty:
-        return None, None
+    empty = {"poc": None, "vah": None, "val": None}
+    if df is None or df.empty:
+        return [dict(empty) for _ in windows]
 
-    total_volume = float(profile["volume"].sum())
-    if total_volume <= 0:
-        return None, None
+    dt_series = _get_datetime_series(df)
+    valid_times = dt_series.dropna()
+    end_time = valid_times.iloc[-1] if not valid_times.empty else None
+
+    low = pd.to_numeric(df.get("low"), errors="coerce").to_numpy(dtype=float)
+    high = pd.to_numeric(df.get("high"), errors="coerce").to_numpy(dtype=float)
+    volume = pd.to_numeric(df.get("volume"), errors="coerce").fillna(0.0).to_numpy(dtype=float)
+    typical_price = pd.to_numeric((df.get("high") + df.get("low") + df.get("close")) / 3, errors="coerce")
+
+    results: List[Dict[str, Optional[float]]] = []
+    for window in windows:
+        if window <= timedelta(0) or end_time is None:
+            mask = np.ones(len(df), dtype=bool)
+        else:
+            mask = (dt_series >= end_time - window).fillna(False).to_numpy(dtype=bool)
+        if not mask.any():
+            results.append(dict(empty))
+            continue
 
-    threshold = total_volume * float(value_area)
-    sorted_profile = profile.sort_values("volume", ascending=False)
+        # El relleno del precio típico se hace dentro de la ventana, igual que si se filtrara el df.
+        window_typical = typical_price[mask].ffill().bfill().to_numpy(dtype=float)
+        results.append(_profile_levels(low[mask], high[mask], volume[mask], window_typical, bins, value_area))
 
-    accumulated = 0.0
-    selected_rows = []
-    for _, row in sorted_profile.iterrows():
-        accumulated += float(row["volume"])
-        selected_rows.append(row)
-        if accumulated >= threshold:
-            break
+    return results
 
-    if not selected_rows:
-        return None, None
 
-    selected_df = pd.DataFrame(selected_rows)
-    vah = float(selected_df["upper"].max())
-    val = float(selected_df["lower"].min())
-    return vah, val
+def _profile_levels(
+    low: np.ndarray,
+    high: np.ndarray,
+    volume: np.ndarray,
+    typical_price: np.ndarray,
+    bins: int,
+    value_area: float,
+) -> Dict[str, Optional[float]]:
+    levels: Dict[str, Optional[float]] = {"poc": None, "vah": None, "val": None}
+
+    with np.errstate(invalid="ignore"):
+        min_price = float(np.nanmin(low)) if np.isfinite(low).any() else float("nan")
+        max_price = float(np.nanmax(high)) if np.isfinite(high).any() else float("nan")
+
+    if not np.isfinite(min_price) or not np.isfinite(max_price):
+        return levels
+
+    if np.isclose(min_price, max_price):
+        levels["poc"] = (min_price + max_price) / 2
+        if float(volume.sum()) > 0:
+            levels["vah"], levels["val"] = max_price, min_price
+        return levels
+
+    bins = max(1, int(bins))
+    edges = np.linspace(min_price, max_price, bins + 1)
+    bin_indices = np.clip(np.digitize(typical_price, edges, right=False) - 1, 0, bins - 1)
+
+    bin_volume = np.bincount(bin_indices, weights=volume, minlength=bins)
+    occupied = np.flatnonzero(np.bincount(bin_indices, minlength=bins))
+    occupied_volume = bin_volume[occupied]
+
+    poc_bin = occupied[int(np.argmax(occupied_volume))]
+    levels["poc"] = float((edges[poc_bin] + edges[poc_bin + 1]) / 2)
+
+    total_volume = float(occupied_volume.sum())
+    if total_volume <= 0:
+        return levels
+
+    order = np.argsort(-occupied_volume, kind="stable")
+    accumulated = np.cumsum(occupied_volume[order])
+    cutoff = min(int(np.searchsorted(accumulated, total_volume * float(value_area), side="left")), len(order) - 1)
+    selected = occupied[order[: cutoff + 1]]
+    levels["vah"] = float(edges[selected.max() + 1])
+    levels["val"] = float(edges[selected.min()])
+    return levels
 
 
 def get_previous_period_extremes(df: pd.DataFrame) -> Dict[str, Optional[float]]:
@@ -161,70 +219,6 @@ def get_session_extremes(df: pd.DataFrame) -> Dict[str, Dict[str, Optional[float
     return sessions
 
 
-def _build_volume_profile(df: pd.DataFrame, window: timedelta, bins: int) -> pd.DataFrame:
-    if df is None or df.empty:
-        return pd.DataFrame(columns=["lower", "upper", "center", "volume"])
-
-    filtered = _filter_by_window(df, window)
-    if filtered.empty:
-        return pd.DataFrame(columns=["lower", "upper", "center", "volume"])
-
-    low_series = pd.to_numeric(filtered.get("low"), errors="coerce")
-    high_series = pd.to_numeric(filtered.get("high"), errors="coerce")
-    volume_series = pd.to_numeric(filtered.get("volume"), errors="coerce").fillna(0.0)
-
-    min_price = float(np.nanmin(low_series))
-    max_price = float(np.nanmax(high_series))
-
-    if not np.isfinite(min_price) or not np.isfinite(max_price):
-        return pd.DataFrame(columns=["lower", "upper", "center", "volume"])
-
-    if np.isclose(min_price, max_price):
-        total_volume = float(volume_series.sum())
-        center = (min_price + max_price) / 2
-        return pd.DataFrame([
-            {"lower": min_price, "upper": max_price, "center": center, "volume": total_volume}
-        ])
-
-    bins = max(1, int(bins))
-    edges = np.linspace(min_price, max_price, bins + 1)
-
-    typical_price = (filtered.get("high") + filtered.get("low") + filtered.get("close")) / 3
-    typical_price = pd.to_numeric(typical_price, errors="coerce").fillna(method="ffill").fillna(method="bfill")
-
-    bin_indices = np.digitize(typical_price, edges, right=False) - 1
-    bin_indices = np.clip(bin_indices, 0, bins - 1)
-
-    accumulated: Dict[int, float] = {}
-    for idx, vol in zip(bin_indices, volume_series):
-        accumulated[idx] = accumulated.get(idx, 0.0) + float(vol)
-
-    data = []
-    for idx, vol in accumulated.items():
-        lower = float(edges[idx])
-        upper = float(edges[idx + 1])
-        center = (lower + upper) / 2
-        data.append({"lower": lower, "upper": upper, "center": center, "volume": vol})
-
-    profile = pd.DataFrame(data)
-    return profile.sort_values("center").reset_index(drop=True)
-
-
-def _filter_by_window(df: pd.DataFrame, window: timedelta) -> pd.DataFrame:
-    if window <= timedelta(0):
-        return df.copy()
-
-    dt_series = _get_datetime_series(df)
-    valid_times = dt_series.dropna()
-    if valid_times.empty:
-        return df.copy()
-
-    end_time = valid_times.iloc[-1]
-    start_time = end_time - window
-    mask = (dt_series >= start_time).fillna(False)
-    return df.loc[mask].copy()
-
-
 def _get_datetime_series(df: pd.DataFrame) -> pd.Series:
     if "datetime" in df.columns:
         dt = pd.to_datetime(df["datetime"], utc=True, errors="coerce")
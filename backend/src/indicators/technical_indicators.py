@@ -1,11 +1,122 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from ..utils.dataframe_helpers import ensure_datetime_index, require_columns
+from ..utils.jit import njit
+
+try:  # pragma: no cover - depends on the optional dependency being installed
+    from scipy.signal import lfilter as _lfilter
+except ImportError:  # pragma: no cover
+    _lfilter = None
+
+
+def _ewm_values(arr: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Equivalent of ``pd.Series(arr).ewm(alpha=alpha, adjust=False).mean()`` on a float array.
+
+    With SciPy installed the recurrence runs as a single IIR filter over the raw array;
+    otherwise, or when the series has gaps after its first value, pandas is used.
+    """
+    start = int(np.argmax(~np.isnan(arr))) if len(arr) else 0
+    tail = arr[start:]
+    if _lfilter is None or not np.isfinite(tail).all():
+        return pd.Series(arr).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+    result = np.full(len(arr), np.nan)
+    if len(tail):
+        # Initial state chosen so the first output equals the first input (adjust=False).
+        result[start:], _ = _lfilter([alpha], [1.0, alpha - 1.0], tail, zi=[(1.0 - alpha) * tail[0]])
+    return result
+
+
+def _ewm_mean(values: pd.Series, alpha: float) -> pd.Series:
+    """Series wrapper around `_ewm_values` that keeps the index and name."""
+    return pd.Series(_ewm_values(values.to_numpy(dtype=float), alpha), index=values.index, name=values.name)
+
+
+@njit(cache=True, nogil=True)
+def _rsi_core(close: np.ndarray, alpha: float) -> np.ndarray:
+    """Wilder RSI in a single pass; matches the pandas ewm(adjust=False) formulation."""
+    n = close.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+
+    out[0] = np.nan
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if i == 1:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+            avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+
+        if avg_loss == 0.0:
+            out[i] = 50.0 if avg_gain == 0.0 else 100.0
+        else:
+            value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            out[i] = min(max(value, 0.0), 100.0)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _adx_core(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ADX, +DI and -DI in one pass with the same Wilder smoothing as the pandas path."""
+    n = high.shape[0]
+    adx = np.empty(n)
+    plus_di = np.empty(n)
+    minus_di = np.empty(n)
+    alpha = 1.0 / period
+
+    atr = 0.0
+    smoothed_plus = 0.0
+    smoothed_minus = 0.0
+    adx_value = 0.0
+    for i in range(n):
+        true_range = high[i] - low[i]
+        plus_dm = 0.0
+        minus_dm = 0.0
+        if i > 0:
+            up_move = high[i] - high[i - 1]
+            down_move = low[i - 1] - low[i]
+            if up_move > down_move and up_move > 0.0:
+                plus_dm = up_move
+            if down_move > up_move and down_move > 0.0:
+                minus_dm = down_move
+            true_range = max(true_range, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+        if i == 0:
+            atr = true_range
+            smoothed_plus = plus_dm
+            smoothed_minus = minus_dm
+        else:
+            atr = (1.0 - alpha) * atr + alpha * true_range
+            smoothed_plus = (1.0 - alpha) * smoothed_plus + alpha * plus_dm
+            smoothed_minus = (1.0 - alpha) * smoothed_minus + alpha * minus_dm
+
+        pdi = 100.0 * smoothed_plus / atr if atr != 0.0 else 0.0
+        mdi = 100.0 * smoothed_minus / atr if atr != 0.0 else 0.0
+        di_sum = pdi + mdi
+        dx = abs(pdi - mdi) / di_sum * 100.0 if di_sum != 0.0 else 0.0
+        adx_value = dx if i == 0 else (1.0 - alpha) * adx_value + alpha * dx
+
+        adx[i] = min(max(adx_value, 0.0), 100.0)
+        plus_di[i] = min(max(pdi, 0.0), 100.0)
+        minus_di[i] = min(max(mdi, 0.0), 100.0)
+    return adx, plus_di, minus_di
 
 
 class TechnicalIndicators:
@@ -32,7 +143,7 @@ class TechnicalIndicators:
         if column not in df.columns:
             raise ValueError(f"DataFrame missing required column: {column}")
 
-        return df[column].ewm(span=period, adjust=False).mean()
+        return _ewm_mean(df[column], 2.0 / (period + 1))
 
     @staticmethod
     def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -51,13 +162,16 @@ class TechnicalIndicators:
 
         require_columns(df, ["high", "low", "close"])
 
-        prev_close = df["close"].shift(1)
-        high_low = df["high"] - df["low"]
-        high_close = (df["high"] - prev_close).abs()
-        low_close = (df["low"] - prev_close).abs()
+        high = df["high"].to_numpy(dtype=float)
+        low = df["low"].to_numpy(dtype=float)
+        prev_close = np.empty_like(high)
+        prev_close[:1] = np.nan
+        prev_close[1:] = df["close"].to_numpy(dtype=float)[:-1]
 
-        true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = true_range.ewm(alpha=1 / period, adjust=False).mean()
+        # fmax ignores the missing previous close on the first bar, like DataFrame.max(axis=1);
+        # applied pairwise so no stacked Nx3 array is materialised.
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        atr = _ewm_mean(pd.Series(true_range, index=df.index), 1 / period)
         return atr
 
     @staticmethod
@@ -77,6 +191,12 @@ class TechnicalIndicators:
 
         require_columns(df, ["high", "low", "close"])
 
+        arrays = [df[col].to_numpy(dtype=float) for col in ("high", "low", "close")]
+        if all(np.isfinite(arr).all() for arr in arrays):
+            adx, plus_di, minus_di = _adx_core(arrays[0], arrays[1], arrays[2], period)
+            return pd.DataFrame({"adx": adx, "plus_di": plus_di, "minus_di": minus_di}, index=df.index)
+
+        # Gaps in the price series keep the pandas NaN semantics.
         high = df["high"]
         low = df["low"]
 
@@ -91,8 +211,8 @@ class TechnicalIndicators:
 
         atr = TechnicalIndicators.calculate_atr(df, period)
 
-        smoothed_plus_dm = plus_dm_series.ewm(alpha=1 / period, adjust=False).mean()
-        smoothed_minus_dm = minus_dm_series.ewm(alpha=1 / period, adjust=False).mean()
+        smoothed_plus_dm = _ewm_mean(plus_dm_series, 1 / period)
+        smoothed_minus_dm = _ewm_mean(minus_dm_series, 1 / period)
 
         with np.errstate(divide="ignore", invalid="ignore"):
             plus_di = 100 * smoothed_plus_dm / atr
@@ -106,7 +226,7 @@ class TechnicalIndicators:
             dx = (plus_di - minus_di).abs() / di_sum * 100
         dx = dx.replace([np.inf, -np.inf], np.nan).fillna(0.0)
 
-        adx = dx.ewm(alpha=1 / period, adjust=False).mean()
+        adx = _ewm_mean(dx, 1 / period)
 
         result = pd.DataFrame({
             "adx": adx.clip(lower=0, upper=100),
@@ -133,12 +253,17 @@ class TechnicalIndicators:
         if column not in df.columns:
             raise ValueError(f"DataFrame missing required column: {column}")
 
+        close = df[column].to_numpy(dtype=float)
+        if np.isfinite(close).all():
+            return pd.Series(_rsi_core(close, 1 / period), index=df.index, name=df[column].name)
+
+        # Gaps in the price series keep the pandas NaN semantics.
         delta = df[column].diff()
         gains = delta.clip(lower=0)
         losses = -delta.clip(upper=0)
 
-        avg_gain = gains.ewm(alpha=1 / period, adjust=False).mean()
-        avg_loss = losses.ewm(alpha=1 / period, adjust=False).mean()
+        avg_gain = _ewm_mean(gains, 1 / period)
+        avg_loss = _ewm_mean(losses, 1 / period)
 
         rs = avg_gain / avg_loss.replace(0, np.nan)
         rsi = 100 - (100 / (1 + rs))
@@ -189,13 +314,12 @@ class TechnicalIndicators:
         typical_price = (indexed["high"] + indexed["low"] + indexed["close"]) / 3
         volume = indexed["volume"]
 
-        session_start = indexed.index.floor("D") + pd.to_timedelta(session_start_hour, unit="h")
-        before_session_start = indexed.index < session_start
-        session_start = session_start.where(~before_session_start, session_start - pd.Timedelta(days=1))
+        # Shifting by the session start makes every session fall on a single calendar day.
+        session_id = (indexed.index - pd.Timedelta(hours=session_start_hour)).floor("D")
 
         vp = typical_price * volume
-        cumulative_vp = vp.groupby(session_start).cumsum()
-        cumulative_volume = volume.groupby(session_start).cumsum().replace(0, np.nan)
+        cumulative_vp = vp.groupby(session_id).cumsum()
+        cumulative_volume = volume.groupby(session_id).cumsum().replace(0, np.nan)
 
         session_vwap = cumulative_vp / cumulative_volume
         session_vwap.index = indexed.index
@@ -208,25 +332,53 @@ class TechnicalIndicators:
         atr_period: int = 14,
         adx_period: int = 14,
         rsi_period: int = 14,
+        float_dtype: Optional[str] = None,
+        max_workers: int = 1,
     ) -> pd.DataFrame:
         """
         Calculate and append the default indicator set to the dataframe.
 
+        Args:
+            float_dtype: Optional dtype (e.g. ``"float32"``) for the appended indicator columns.
+                Indicators are always computed in float64 before the downcast, and the input
+                OHLCV columns keep their dtype.
+            max_workers: Threads used to compute the independent indicators. The Numba
+                kernels release the GIL, so values above 1 only help on long histories.
+
         Returns:
             DataFrame with additional indicator columns.
         """
         ema_periods = list(ema_periods or [20, 50])
-        result = df.copy()
-
-        for period in ema_periods:
-            result[f"ema_{period}"] = self.calculate_ema(result, period)
-
-        result["atr"] = self.calculate_atr(result, atr_period)
-
-        adx_df = self.calculate_adx(result, adx_period)
-        result = result.join(adx_df)
-
-        result["rsi"] = self.calculate_rsi(result, rsi_period)
-        result["vwap"] = self.calculate_vwap(result)
+        require_columns(df, ["close"])
+        if any(period <= 0 for period in ema_periods):
+            raise ValueError("period must be positive")
 
-        return result
+        # All EMAs read the same close buffer instead of re-extracting the column per period.
+        close = df["close"].to_numpy(dtype=float)
+        tasks: List[Callable[[], object]] = [partial(_ewm_values, close, 2.0 / (period + 1)) for period in ema_periods]
+        tasks += [
+            partial(self.calculate_atr, df, atr_period),
+            partial(self.calculate_adx, df, adx_period),
+            partial(self.calculate_rsi, df, rsi_period),
+            partial(self.calculate_vwap, df),
+        ]
+
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+                outputs = list(pool.map(lambda task: task(), tasks))
+        else:
+            outputs = [task() for task in tasks]
+
+        atr, adx_df, rsi, vwap = outputs[len(ema_periods):]
+        columns = {f"ema_{period}": values for period, values in zip(ema_periods, outputs)}
+        columns["atr"] = atr.to_numpy()
+        for name in adx_df.columns:
+            columns[name] = adx_df[name].to_numpy()
+        columns["rsi"] = rsi.to_numpy()
+        columns["vwap"] = vwap.to_numpy()
+
+        # A single concat instead of one block insertion per column (and a join for ADX).
+        indicators = pd.DataFrame(columns, index=df.index)
+        if float_dtype is not None:
+            indicators = indicators.astype(float_dtype, copy=False)
+        return pd.concat([df.drop(columns=indicators.columns.intersection(df.columns)), indicators], axis=1)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from src.indicators.market_structure import MarketStructure
+from src.utils.dataframe_helpers import last_bar_signature
 
 
 class BTCFilter:
@@ -17,6 +18,8 @@ class BTCFilter:
 
     def __init__(self) -> None:
         self._market_structure = MarketStructure()
+        # Último contexto calculado, indexado por la firma de la última vela 4H y 1H.
+        self._context_cache: Optional[Tuple[Tuple[Tuple[object, ...], ...], Dict[str, object]]] = None
 
     def analyze_btc_context(self, btc_df_4h: pd.DataFrame, btc_df_1h: pd.DataFrame) -> Dict[str, object]:
         """
@@ -38,9 +41,14 @@ class BTCFilter:
                 "adx": float("nan"),
             }
 
+        cache_key = self._context_key(btc_df_4h, btc_df_1h)
+        session = self._get_session_quality()
+        if cache_key is not None and self._context_cache is not None and self._context_cache[0] == cache_key:
+            # Mismas velas: solo la calidad de sesión depende del reloj y se recalcula.
+            return {**self._context_cache[1], "session_quality": session}
+
         trend_info = self._get_trend_from_df(btc_df_4h)
         volatility = self._calculate_volatility(btc_df_4h)
-        session = self._get_session_quality()
         multipliers = self._calculate_multipliers(trend_info, volatility)
         should_trade = self._should_trade_decision(trend_info, volatility)
 
@@ -48,7 +56,7 @@ class BTCFilter:
         atr_value = float(btc_df_4h.get("atr", pd.Series([np.nan])).iloc[-1])
         adx_value = float(btc_df_4h.get("adx", pd.Series([np.nan])).iloc[-1])
 
-        return {
+        context = {
             "trend": trend_info.get("trend", "INESTABLE"),
             "trend_strength": float(trend_info.get("trend_strength", 0.0)),
             "volatility": volatility,
@@ -60,6 +68,18 @@ class BTCFilter:
             "atr": atr_value,
             "adx": adx_value,
         }
+        if cache_key is not None:
+            self._context_cache = (cache_key, context)
+        return dict(context)
+
+    @staticmethod
+    def _context_key(btc_df_4h: pd.DataFrame, btc_df_1h: pd.DataFrame) -> Optional[Tuple[Tuple[object, ...], ...]]:
+        # Las velas en formación se reescriben con el mismo timestamp: la clave incluye sus valores.
+        key_4h = last_bar_signature(btc_df_4h)
+        key_1h = last_bar_signature(btc_df_1h)
+        if key_4h is None or key_1h is None:
+            return None
+        return key_4h, key_1h
 
     def _get_session_quality(self) -> str:
         """
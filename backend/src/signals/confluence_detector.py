@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 
 class ConfluenceDetector:
@@ -13,23 +15,28 @@ class ConfluenceDetector:
         levels: Dict[str, Optional[float]],
         tolerance: float = 0.005,
     ) -> Dict[str, object]:
+        names = list(levels.keys())
+        values = np.array(
+            [float(level) if isinstance(level, (int, float)) else np.nan for level in levels.values()],
+            dtype=float,
+        )
+        return self.detect_confluences_array(price, names, values, tolerance)
+
+    def detect_confluences_array(
+        self,
+        price: float,
+        names: Sequence[str],
+        values: np.ndarray,
+        tolerance: float = 0.005,
+    ) -> Dict[str, object]:
+        """Igual que `detect_confluences`, con los niveles como nombres + array paralelo (NaN = ausente)."""
         if not math.isfinite(price) or price <= 0:
             return {"count": 0, "levels": [], "multiplier": 1.0}
 
         tolerance = max(0.0, float(tolerance))
-        nearby: List[str] = []
-
-        for name, level in levels.items():
-            if level is None:
-                continue
-            if not isinstance(level, (int, float)):
-                continue
-            if not math.isfinite(level) or level <= 0:
-                continue
-
-            distance = abs(price - float(level)) / price
-            if distance <= tolerance:
-                nearby.append(name)
+        with np.errstate(invalid="ignore"):
+            mask = np.isfinite(values) & (values > 0) & (np.abs(price - values) <= tolerance * price)
+        nearby: List[str] = [names[i] for i in np.flatnonzero(mask)]
 
         multiplier = self.calculate_multiplier(len(nearby))
         return {"count": len(nearby), "levels": nearby, "multiplier": multiplier}
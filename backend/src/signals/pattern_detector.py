@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+_CANDLE_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Ningún patrón mira más allá de las últimas 3 velas.
+_PATTERN_WINDOW = 3
+
 
 class PatternDetector:
     """Detecta patrones de velas japonesas."""
@@ -177,25 +183,58 @@ class PatternDetector:
                 'score': 10  # Puntos por patrones detectados
             }
         """
+        if df is None or df.empty:
+            bullish, bearish = self._detect_patterns(df, support_zone, resistance_zone)
+        else:
+            # Solo las columnas presentes: los detectores que no usan volumen siguen funcionando sin él.
+            columns = tuple(column for column in _CANDLE_COLUMNS if column in df)
+            candles = df.tail(_PATTERN_WINDOW)[list(columns)].to_numpy(dtype=float)
+            bullish, bearish = _patterns_for_candles(
+                type(self), columns, candles.tobytes(), len(candles), support_zone, resistance_zone
+            )
+
+        # Consolidar score: 10 puntos si hay algún patrón, 0 si no.
+        has_pattern = bool(bullish or bearish)
+        score = 10 if has_pattern else 0
+
+        return {"bullish": list(bullish), "bearish": list(bearish), "score": score}
+
+    @classmethod
+    def _detect_patterns(
+        cls,
+        df: pd.DataFrame,
+        support_zone: Optional[float],
+        resistance_zone: Optional[float],
+    ) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
         bullish: List[str] = []
         bearish: List[str] = []
 
-        if self.detect_bullish_engulfing(df):
+        if cls.detect_bullish_engulfing(df):
             bullish.append("engulfing")
-        if self.detect_hammer(df, at_support=support_zone is not None, support_zone=support_zone):
+        if cls.detect_hammer(df, at_support=support_zone is not None, support_zone=support_zone):
             bullish.append("hammer")
-        if self.detect_three_consecutive(df, "bullish"):
+        if cls.detect_three_consecutive(df, "bullish"):
             bullish.append("3_consecutive")
 
-        if self.detect_bearish_engulfing(df):
+        if cls.detect_bearish_engulfing(df):
             bearish.append("engulfing")
-        if self.detect_shooting_star(df, at_resistance=resistance_zone is not None, resistance_zone=resistance_zone):
+        if cls.detect_shooting_star(df, at_resistance=resistance_zone is not None, resistance_zone=resistance_zone):
             bearish.append("shooting_star")
-        if self.detect_three_consecutive(df, "bearish"):
+        if cls.detect_three_consecutive(df, "bearish"):
             bearish.append("3_consecutive")
 
-        # Consolidar score: 10 puntos si hay algún patrón, 0 si no.
-        has_pattern = bool(bullish or bearish)
-        score = 10 if has_pattern else 0
-
-        return {"bullish": bullish, "bearish": bearish, "score": score}
+        return tuple(bullish), tuple(bearish)
+
+
+@lru_cache(maxsize=256)
+def _patterns_for_candles(
+    detector_cls: type,
+    columns: Tuple[str, ...],
+    candles: bytes,
+    rows: int,
+    support_zone: Optional[float],
+    resistance_zone: Optional[float],
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Patrones de las últimas velas, memoizados por clase de detector y valores OHLCV."""
+    values = np.frombuffer(candles, dtype=float).reshape(rows, len(columns))
+    return detector_cls._detect_patterns(pd.DataFrame(values, columns=list(columns)), support_zone, resistance_zone)
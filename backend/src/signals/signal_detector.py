@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
@@ -42,7 +43,7 @@ class SignalDetector:
             support_level is not None and support_distance <= 0.01,
             "ALCISTA" in str(trend_info.get("trend", "")).upper(),
             str(trend_info.get("structure", "")).upper() == "HH/HL",
-            not np.isnan(vwap_value) and current_price >= vwap_value * 0.995,
+            not math.isnan(vwap_value) and current_price >= vwap_value * 0.995,
         ]
         structure_valid = all(structure_conditions)
         if structure_valid:
@@ -60,8 +61,7 @@ class SignalDetector:
 
         base_score += orderflow_score
         reasons.append(
-            "Presión compradora real (ΔCVD %.2f | score %d)"
-            % (orderflow_result["cvd_change_normalized"], orderflow_score)
+            f"Presión compradora real (ΔCVD {orderflow_result['cvd_change_normalized']:.2f} | score {orderflow_score:d})"
         )
 
         divergence = self.orderflow_analyzer.detect_cvd_divergence(df_1h["close"], cvd_1h, lookback=20)
@@ -132,7 +132,7 @@ class SignalDetector:
             resistance_level is not None and resistance_distance <= 0.01,
             "BAJISTA" in str(trend_info.get("trend", "")).upper(),
             str(trend_info.get("structure", "")).upper() == "LH/LL",
-            not np.isnan(vwap_value) and current_price <= vwap_value * 1.005,
+            not math.isnan(vwap_value) and current_price <= vwap_value * 1.005,
         ]
         structure_valid = all(structure_conditions)
         if structure_valid:
@@ -152,8 +152,7 @@ class SignalDetector:
 
         base_score += orderflow_score
         reasons.append(
-            "Presión vendedora real (ΔCVD %.2f | score %d)"
-            % (orderflow_result["cvd_change_normalized"], orderflow_score)
+            f"Presión vendedora real (ΔCVD {orderflow_result['cvd_change_normalized']:.2f} | score {orderflow_score:d})"
         )
 
         divergence = self.orderflow_analyzer.detect_cvd_divergence(df_1h["close"], cvd_1h, lookback=20)
@@ -209,10 +208,11 @@ class SignalDetector:
             price = level.get("price")
             if price is None:
                 continue
-            distance = abs(current_price - price) / max(price, 1e-8)
+            price = float(price)
+            distance = math.fabs(current_price - price) / max(price, 1e-8)
             if distance < best_distance:
                 best_distance = distance
-                best_level = float(price)
+                best_level = price
         if best_level is None:
             return None, float("inf")
         return best_level, best_distance
@@ -254,4 +254,5 @@ class SignalDetector:
             return 0.0
         historical = df["volume"].iloc[-window - 1 : -1] if len(df) > window else df["volume"].iloc[:-1]
         avg = historical.mean()
-        return float(avg) if not np.isnan(avg) else 0.0
+        avg = float(avg)
+        return avg if not math.isnan(avg) else 0.0
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-import copy
+import logging
 import math
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from heapq import nlargest
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -12,13 +20,13 @@ from src.config import settings
 from src.data.cvd_storage import CVDStorage
 from src.data.data_storage import DataStorage
 from src.indicators.key_levels import (
-    calculate_poc,
-    calculate_value_area,
+    calculate_volume_profile,
     get_previous_period_extremes,
     get_session_extremes,
 )
 from src.indicators.market_structure import MarketStructure
 from src.indicators.technical_indicators import TechnicalIndicators
+from src.utils.dataframe_helpers import last_bar_signature
 from src.utils.logger import get_logger
 from .btc_filter import BTCFilter
 from .confluence_detector import ConfluenceDetector
@@ -28,11 +36,24 @@ from .signal_scorer import SignalScorer
 
 logger = get_logger(__name__)
 
+_SIGNAL_VALIDITY = timedelta(hours=1)
+_INF = float("inf")
+
+# Multiplicador de ATR para el stop según el activo (el resto de alts usa el default).
+_ATR_STOP_MULTIPLIERS: Dict[str, float] = {"BTC/USDT": 1.5, "ETH/USDT": 2.0}
+_DEFAULT_ATR_STOP_MULTIPLIER = 2.5
+_TP_RISK_MULTIPLES = (2.0, 3.0, 4.0)
+_POSITION_SIZE_BY_CONFIDENCE: Dict[str, float] = {"ALTA": 1.5, "MEDIA": 1.0}
+_DEFAULT_POSITION_SIZE = 0.5
+
 
 class SignalEngine:
     """Motor principal que orquesta todo el análisis."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_workers: Optional[int] = None, key_levels_cache_dir: Optional[str] = None) -> None:
+        self.max_workers = max(1, max_workers if max_workers is not None else settings.SCAN_WORKERS)
+        cache_dir = key_levels_cache_dir if key_levels_cache_dir is not None else settings.KEY_LEVELS_CACHE_DIR
+        self._key_levels_dir: Optional[Path] = Path(cache_dir) if cache_dir else None
         self.storage = DataStorage(settings.DB_PATH)
         self.cvd_storage = CVDStorage()
         self.technical_indicators = TechnicalIndicators()
@@ -42,6 +63,25 @@ class SignalEngine:
         self.confluence_detector = ConfluenceDetector()
         self.signal_scorer = SignalScorer(self.confluence_detector)
         self._key_levels_cache: Dict[str, Dict[str, object]] = {}
+        self._ohlcv_cache: Dict[Tuple[str, str], Tuple[Tuple[object, ...], pd.DataFrame]] = {}
+        # Pool persistente: los workers conservan sus caches de OHLCV/niveles entre escaneos.
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        """Cierra el pool de procesos del escáner, si existe."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            cache_dir = str(self._key_levels_dir) if self._key_levels_dir is not None else ""
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_scan_worker,
+                initargs=(cache_dir,),
+            )
+        return self._pool
 
     def scan_for_signals(self, symbols: Optional[List[str]] = None) -> List[Signal]:
         if symbols is None:
@@ -63,176 +103,209 @@ class SignalEngine:
             logger.warning("BTC context no favorable para operar: %s", btc_context.get("trend"))
             return []
 
-        for symbol in symbols:
-            logger.info("Escaneando %s...", symbol)
-            df_4h = self._load_and_prepare_data(symbol, "4h")
-            df_1h = self._load_and_prepare_data(symbol, "1h")
+        workers = min(self.max_workers, len(symbols))
+        if workers > 1:
+            # Cada símbolo es independiente: se reparte entre procesos, cada uno con su propio engine.
+            pool = self._get_pool()
+            futures = [(symbol, pool.submit(_scan_symbol_in_worker, symbol, btc_context)) for symbol in symbols]
+            for index, (symbol, future) in enumerate(futures):
+                try:
+                    signals.extend(future.result())
+                except BrokenProcessPool as exc:
+                    # El pool roto no se puede reutilizar: todos los futuros pendientes fallarían igual.
+                    failed = [pending for pending, _ in futures[index:]]
+                    logger.error("Pool de escaneo roto (%s); símbolos sin escanear: %s", exc, ", ".join(failed))
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                    break
+                except Exception as exc:
+                    logger.exception("Error escaneando %s: %s", symbol, exc)
+        else:
+            for symbol in symbols:
+                signals.extend(self._scan_symbol(symbol, btc_context))
+
+        return nlargest(2, signals, key=attrgetter("score"))
+
+    def _scan_symbol(self, symbol: str, btc_context: Dict[str, object]) -> List[Signal]:
+        # Referencias locales: evitan lookups globales/atributos dentro del loop de setups.
+        log = logger
+        info_enabled = log.isEnabledFor(logging.INFO)
+        load = self._load_and_prepare_data
+        load_cvd = self._load_cvd_series
+        ms = self.market_structure
+        detect_long = self.signal_detector.detect_long_setup
+        detect_short = self.signal_detector.detect_short_setup
+        score_all = self.signal_scorer.calculate_final_scores
+        detect_sweep = self._detect_previous_extreme_sweep
+        get_levels = self._get_or_compute_levels
+        create_signal = self._create_signal
 
-            if df_4h.empty or df_1h.empty:
-                logger.warning("Datos insuficientes para %s", symbol)
-                continue
+        signals: List[Signal] = []
 
-            df_4h_struct = self.market_structure.detect_swing_points(df_4h)
-            sr = self.market_structure.identify_support_resistance(df_4h_struct)
-            trend = self.market_structure.determine_trend(df_4h_struct)
+        if info_enabled:
+            log.info("Escaneando %s...", symbol)
+        df_4h = load(symbol, "4h")
+        df_1h = load(symbol, "1h")
 
-            market_structure = {
-                "supports": sr.get("supports", []),
-                "resistances": sr.get("resistances", []),
-                "trend": trend,
-            }
+        if df_4h.empty or df_1h.empty:
+            log.warning("Datos insuficientes para %s", symbol)
+            return []
 
-            cvd_4h = (
-                self._load_cvd_series(symbol, "4h", df_4h_struct["timestamp"]) if "timestamp" in df_4h_struct else np.array([])
-            )
-            cvd_1h = (
-                self._load_cvd_series(symbol, "1h", df_1h["timestamp"]) if "timestamp" in df_1h else np.array([])
-            )
+        df_4h_struct = ms.detect_swing_points(df_4h)
+        sr = ms.identify_support_resistance(df_4h_struct)
+        trend = ms.determine_trend(df_4h_struct)
+
+        market_structure = {
+            "supports": sr.get("supports", []),
+            "resistances": sr.get("resistances", []),
+            "trend": trend,
+        }
 
-            long_setup = self.signal_detector.detect_long_setup(df_4h_struct, df_1h, cvd_4h, cvd_1h, market_structure)
-            short_setup = self.signal_detector.detect_short_setup(df_4h_struct, df_1h, cvd_4h, cvd_1h, market_structure)
+        cvd_4h = load_cvd(symbol, "4h", df_4h_struct["timestamp"]) if "timestamp" in df_4h_struct else np.array([])
+        cvd_1h = load_cvd(symbol, "1h", df_1h["timestamp"]) if "timestamp" in df_1h else np.array([])
 
-            key_levels = self._get_or_compute_key_levels(symbol, df_1h)
-            indicator_context = self._build_indicator_context(df_1h)
-            current_price = float(df_1h["close"].iloc[-1])
+        long_setup = detect_long(df_4h_struct, df_1h, cvd_4h, cvd_1h, market_structure)
+        short_setup = detect_short(df_4h_struct, df_1h, cvd_4h, cvd_1h, market_structure)
+
+        key_levels, indicator_context = get_levels(symbol, df_1h)
+        last_row = df_1h.iloc[-1]
+        current_price = float(last_row["close"])
+        atr = self._get_last_indicator(df_1h, "atr")
+        adx = self._get_last_indicator(df_1h, "adx")
+        rsi = self._get_last_indicator(df_1h, "rsi")
 
-            for setup in [long_setup, short_setup]:
-                if not setup:
-                    continue
+        candidates: List[Tuple[str, Dict[str, object]]] = []
+        for setup in (long_setup, short_setup):
+            if not setup:
+                continue
+            augmented_setup = dict(setup)
+            direction = str(augmented_setup.get("direction", "LONG")).upper()
+            augmented_setup["previous_extreme_sweep"] = detect_sweep(df_1h, key_levels, direction)
+            candidates.append((direction, augmented_setup))
+
+        if not candidates:
+            return signals
+
+        score_results = score_all(
+            [augmented_setup for _, augmented_setup in candidates],
+            btc_context,
+            symbol,
+            current_price,
+            key_levels,
+            indicator_context,
+        )
 
-                augmented_setup = dict(setup)
-                direction = str(augmented_setup.get("direction", "LONG")).upper()
-                augmented_setup["previous_extreme_sweep"] = self._detect_previous_extreme_sweep(
-                    df_1h, key_levels, direction
+        for (direction, augmented_setup), score_result in zip(candidates, score_results):
+            confluence_data = score_result.get("confluence", {})
+            if info_enabled and confluence_data.get("count", 0) > 0:
+                log.info(
+                    "Confluencia detectada %s %s | niveles=%s multiplicador=%.2f bonus=%s",
+                    symbol,
+                    direction,
+                    confluence_data.get("levels", []),
+                    float(confluence_data.get("multiplier", 1.0)),
+                    confluence_data.get("bonus", 0),
                 )
 
-                score_result = self.signal_scorer.calculate_final_score(
+            if not score_result.get("should_alert", False):
+                continue
+
+            try:
+                signal = create_signal(
+                    symbol,
+                    direction,
                     augmented_setup,
+                    score_result,
                     btc_context,
-                    symbol,
                     current_price,
+                    atr,
+                    adx,
+                    rsi,
                     key_levels,
-                    indicator_context,
+                    confluence_data,
                 )
+                signals.append(signal)
+            except Exception as exc:
+                log.exception("Error creando señal para %s: %s", symbol, exc)
 
-                confluence_data = score_result.get("confluence", {})
-                if confluence_data.get("count", 0) > 0:
-                    logger.info(
-                        "Confluencia detectada %s %s | niveles=%s multiplicador=%.2f bonus=%s",
-                        symbol,
-                        direction,
-                        confluence_data.get("levels", []),
-                        float(confluence_data.get("multiplier", 1.0)),
-                        confluence_data.get("bonus", 0),
-                    )
-
-                if not score_result.get("should_alert", False):
-                    continue
-
-                try:
-                    signal = self._create_signal(
-                        symbol,
-                        augmented_setup,
-                        score_result,
-                        btc_context,
-                        df_1h,
-                        key_levels,
-                        confluence_data,
-                    )
-                    signals.append(signal)
-                except Exception as exc:
-                    logger.exception("Error creando señal para %s: %s", symbol, exc)
-
-        signals.sort(key=lambda s: s.score, reverse=True)
-        return signals[:2]
+        return signals
 
     def _load_and_prepare_data(self, symbol: str, timeframe: str, limit: int = 200) -> pd.DataFrame:
         df = self.storage.get_ohlcv(symbol, timeframe, limit)
         if df.empty:
             return df
-        df_indicators = self.technical_indicators.add_all_indicators(df)
+
+        # Si la última vela (incluidos sus valores, que cambian mientras se forma) no cambió desde el
+        # scan anterior, reutilizar los indicadores ya calculados.
+        cache_key = (symbol, timeframe)
+        signature = last_bar_signature(df)
+        cached = self._ohlcv_cache.get(cache_key)
+        if cached is not None and signature is not None and cached[0] == signature:
+            return cached[1]
+
+        # Las tolerancias de scoring son relativas (~5e-3): float32 alcanza para los indicadores.
+        # OHLCV se mantiene en float64 porque entrada, stop y TPs salen del close.
+        df_indicators = self.technical_indicators.add_all_indicators(df, float_dtype="float32")
+        if signature is not None:
+            self._ohlcv_cache[cache_key] = (signature, df_indicators)
         return df_indicators
 
     def _load_cvd_series(self, symbol: str, timeframe: str, timestamps: pd.Series) -> np.ndarray:
         if timestamps is None or len(timestamps) == 0:
             return np.array([], dtype=float)
 
-        cvd_df = self.cvd_storage.get_cvd(symbol, timeframe, limit=len(timestamps) + 10)
-        if cvd_df.empty:
+        cvd = self.cvd_storage.get_cvd_for_timestamps(symbol, timeframe, timestamps)
+        if np.isnan(cvd).all():
             return np.array([], dtype=float)
-
-        cvd_map = {int(row.timestamp): float(row.cvd_cumulative) for row in cvd_df.itertuples()}
-
-        aligned: List[float] = []
-        for value in timestamps:
-            if pd.isna(value):
-                aligned.append(np.nan)
-            else:
-                aligned.append(cvd_map.get(int(value), np.nan))
-
-        return np.array(aligned, dtype=float)
+        return cvd
 
     def _create_signal(
         self,
         symbol: str,
+        direction: str,
         setup: Dict[str, object],
         score_result: Dict[str, object],
         btc_context: Dict[str, object],
-        df_1h: pd.DataFrame,
+        current_price: float,
+        atr: float,
+        adx: float,
+        rsi: float,
         key_levels: Dict[str, Optional[float]],
         confluence: Dict[str, object],
     ) -> Signal:
-        current_price = float(df_1h["close"].iloc[-1])
-        atr = self._get_last_indicator(df_1h, "atr")
-        adx = self._get_last_indicator(df_1h, "adx")
-        rsi = self._get_last_indicator(df_1h, "rsi")
-        direction = str(setup.get("direction", "LONG")).upper()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
 
-        if symbol == "BTC/USDT":
-            atr_multiplier = 1.5
-        elif symbol == "ETH/USDT":
-            atr_multiplier = 2.0
-        else:
-            atr_multiplier = 2.5
+        atr_multiplier = _ATR_STOP_MULTIPLIERS.get(symbol, _DEFAULT_ATR_STOP_MULTIPLIER)
 
         min_risk_distance = current_price * 0.005
 
         if direction == "LONG":
             support_value = setup.get("support_level")
-            if support_value is None or pd.isna(support_value):
+            if support_value is None or math.isnan(float(support_value)):
                 support = current_price * 0.98
             else:
                 support = float(support_value)
-            stop_loss = support - atr * atr_multiplier if not pd.isna(atr) else support * 0.98
+            stop_loss = support - atr * atr_multiplier if not math.isnan(atr) else support * 0.98
             if stop_loss >= current_price:
-                stop_loss = current_price - max(min_risk_distance, abs(current_price - support))
+                stop_loss = current_price - max(min_risk_distance, math.fabs(current_price - support))
             risk = max(current_price - stop_loss, min_risk_distance)
-            tp1 = current_price + (risk * 2)
-            tp2 = current_price + (risk * 3)
-            tp3 = current_price + (risk * 4)
+            tp1, tp2, tp3 = (current_price + risk * multiple for multiple in _TP_RISK_MULTIPLES)
         else:
             resistance_value = setup.get("resistance_level")
-            if resistance_value is None or pd.isna(resistance_value):
+            if resistance_value is None or math.isnan(float(resistance_value)):
                 resistance = current_price * 1.02
             else:
                 resistance = float(resistance_value)
-            stop_loss = resistance + atr * atr_multiplier if not pd.isna(atr) else resistance * 1.02
+            stop_loss = resistance + atr * atr_multiplier if not math.isnan(atr) else resistance * 1.02
             if stop_loss <= current_price:
-                stop_loss = current_price + max(min_risk_distance, abs(resistance - current_price))
+                stop_loss = current_price + max(min_risk_distance, math.fabs(resistance - current_price))
             risk = max(stop_loss - current_price, min_risk_distance)
-            tp1 = current_price - (risk * 2)
-            tp2 = current_price - (risk * 3)
-            tp3 = current_price - (risk * 4)
+            tp1, tp2, tp3 = (current_price - risk * multiple for multiple in _TP_RISK_MULTIPLES)
 
-        risk_percent = abs((stop_loss - current_price) / current_price) * 100
+        risk_percent = math.fabs((stop_loss - current_price) / current_price) * 100
 
         confidence = score_result.get("confidence", "BAJA")
-        if confidence == "ALTA":
-            position_size = 1.5
-        elif confidence == "MEDIA":
-            position_size = 1.0
-        else:
-            position_size = 0.5
+        position_size = _POSITION_SIZE_BY_CONFIDENCE.get(confidence, _DEFAULT_POSITION_SIZE)
 
         return Signal(
             symbol=symbol,
@@ -248,32 +321,86 @@ class SignalEngine:
             suggested_position_size=position_size,
             btc_trend=str(btc_context.get("trend", "")),
             session_quality=str(btc_context.get("session_quality", "BAJA")),
-            timestamp=datetime.utcnow(),
-            valid_until=datetime.utcnow() + timedelta(hours=1),
+            timestamp=now,
+            valid_until=now + _SIGNAL_VALIDITY,
             reasons=list(setup.get("reasons", [])),
             atr_value=atr,
             adx_value=adx,
             rsi_value=rsi,
             base_score=float(score_result.get("base_score", 0.0)),
             base_components=dict(score_result.get("base_components", {})),
-            key_levels=copy.deepcopy(key_levels),
-            confluence=copy.deepcopy(confluence),
+            key_levels=self._clone_key_levels(key_levels),
+            confluence=self._clone_confluence(confluence),
             btc_multiplier=float(score_result.get("btc_multiplier", 1.0)),
             total_bonus=int(score_result.get("bonus", 0)),
         )
 
-    def _get_or_compute_key_levels(self, symbol: str, df: pd.DataFrame) -> Dict[str, object]:
+    def _get_or_compute_levels(
+        self, symbol: str, df: pd.DataFrame
+    ) -> Tuple[Dict[str, object], Dict[str, Optional[float]]]:
+        """Key levels + contexto de indicadores, recalculados cuando cambia la última vela 1H (o sus valores)."""
+        last_bar = last_bar_signature(df)
         cache_entry = self._key_levels_cache.get(symbol)
-        now = datetime.utcnow()
-        if cache_entry and (now - cache_entry["timestamp"]).total_seconds() < 3600:
-            return copy.deepcopy(cache_entry["data"])
+        if cache_entry is None and last_bar is not None:
+            cache_entry = self._read_key_levels_from_disk(symbol)
+            if cache_entry is not None:
+                self._key_levels_cache[symbol] = cache_entry
+        if cache_entry and last_bar is not None and cache_entry["last_bar"] == last_bar:
+            return self._clone_key_levels(cache_entry["data"]), dict(cache_entry["indicator_context"])
+
+        key_levels = self._compute_key_levels(df)
+        indicator_context = self._build_indicator_context(df)
+        if last_bar is not None:
+            cache_entry = {
+                "last_bar": last_bar,
+                "data": key_levels,
+                "indicator_context": indicator_context,
+            }
+            self._key_levels_cache[symbol] = cache_entry
+            self._write_key_levels_to_disk(symbol, cache_entry)
+        return self._clone_key_levels(key_levels), dict(indicator_context)
+
+    def _key_levels_path(self, symbol: str) -> Optional[Path]:
+        if self._key_levels_dir is None:
+            return None
+        return self._key_levels_dir / f"{symbol.replace('/', '_')}.pkl"
+
+    def _read_key_levels_from_disk(self, symbol: str) -> Optional[Dict[str, object]]:
+        path = self._key_levels_path(symbol)
+        if path is None or not path.exists():
+            return None
+        try:
+            with path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except Exception as exc:
+            logger.warning("No se pudo leer la caché de key levels de %s: %s", symbol, exc)
+            return None
+        if not isinstance(entry, dict) or "last_bar" not in entry:
+            return None
+        return entry
 
+    def _write_key_levels_to_disk(self, symbol: str, entry: Dict[str, object]) -> None:
+        path = self._key_levels_path(symbol)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Escritura atómica: un lector concurrente nunca ve un pickle a medio escribir.
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            logger.warning("No se pudo guardar la caché de key levels de %s: %s", symbol, exc)
+
+    def _compute_key_levels(self, df: pd.DataFrame) -> Dict[str, object]:
         weekly_window = timedelta(days=7)
         daily_window = timedelta(days=1)
 
-        poc_weekly = calculate_poc(df, weekly_window)
-        poc_daily = calculate_poc(df, daily_window)
-        vah, val = calculate_value_area(df, weekly_window)
+        weekly_profile, daily_profile = calculate_volume_profile(df, (weekly_window, daily_window))
+        poc_weekly = weekly_profile["poc"]
+        poc_daily = daily_profile["poc"]
+        vah, val = weekly_profile["vah"], weekly_profile["val"]
         extremes = get_previous_period_extremes(df)
         sessions = get_session_extremes(df)
 
@@ -297,8 +424,7 @@ class SignalEngine:
             else {},
         }
 
-        self._key_levels_cache[symbol] = {"timestamp": now, "data": copy.deepcopy(key_levels)}
-        return copy.deepcopy(key_levels)
+        return key_levels
 
     def _build_indicator_context(self, df: pd.DataFrame) -> Dict[str, Optional[float]]:
         vwap = self._sanitize_level(self._get_last_indicator(df, "vwap"))
@@ -320,34 +446,39 @@ class SignalEngine:
         if df is None or df.empty:
             return False
 
+        recent = df.iloc[-max(lookback, 2):][["low", "high", "close"]].to_numpy(dtype=float)
+        if len(recent) < 2:
+            return False
+        low_min = float(recent[:, 0].min())
+        high_max = float(recent[:, 1].max())
+        last_close = float(recent[-1, 2])
+
         direction = direction.upper()
         if direction == "LONG":
             levels = [self._sanitize_level(key_levels.get("pdl")), self._sanitize_level(key_levels.get("pwl"))]
-            return any(self._did_price_sweep(df, level, "LONG", lookback) for level in levels if level)
-        if direction == "SHORT":
+        elif direction == "SHORT":
             levels = [self._sanitize_level(key_levels.get("pdh")), self._sanitize_level(key_levels.get("pwh"))]
-            return any(self._did_price_sweep(df, level, "SHORT", lookback) for level in levels if level)
-        return False
-
-    def _did_price_sweep(self, df: pd.DataFrame, level: Optional[float], direction: str, lookback: int) -> bool:
-        if level is None or level <= 0:
-            return False
-        if df is None or df.empty:
+        else:
             return False
+        return any(
+            self._did_price_sweep(level, direction, low_min, high_max, last_close) for level in levels if level
+        )
 
-        recent = df.tail(max(lookback, 2))
-        if len(recent) < 2:
+    @staticmethod
+    def _did_price_sweep(
+        level: Optional[float],
+        direction: str,
+        low_min: float,
+        high_max: float,
+        last_close: float,
+    ) -> bool:
+        if level is None or level <= 0:
             return False
 
-        direction = direction.upper()
         if direction == "LONG":
-            swept = float(recent["low"].min()) < level * 0.999
-            closed_above = float(recent["close"].iloc[-1]) > level
-            return bool(swept and closed_above)
+            return low_min < level * 0.999 and last_close > level
         if direction == "SHORT":
-            swept = float(recent["high"].max()) > level * 1.001
-            closed_below = float(recent["close"].iloc[-1]) < level
-            return bool(swept and closed_below)
+            return high_max > level * 1.001 and last_close < level
         return False
 
     def _get_session_vwap_value(self, df: pd.DataFrame, session_start_hour: int = 13) -> float:
@@ -359,23 +490,58 @@ class SignalEngine:
             return float("nan")
         return float(session_vwap.iloc[-1])
 
+    @staticmethod
+    def _clone_key_levels(key_levels: Dict[str, object]) -> Dict[str, object]:
+        """Copia los niveles clave; solo `sessions` tiene dicts anidados, el resto son escalares."""
+        clone = dict(key_levels)
+        sessions = key_levels.get("sessions") or {}
+        clone["sessions"] = {name: dict(values) for name, values in sessions.items()}
+        return clone
+
+    @staticmethod
+    def _clone_confluence(confluence: Dict[str, object]) -> Dict[str, object]:
+        clone = dict(confluence)
+        if "levels" in clone:
+            clone["levels"] = list(clone["levels"] or [])
+        return clone
+
     @staticmethod
     def _sanitize_level(value: object) -> Optional[float]:
         if value is None:
             return None
-        try:
-            result = float(value)
-        except (TypeError, ValueError):
-            return None
-        if math.isnan(result) or math.isinf(result):
-            return None
-        return result
+        if type(value) is float:
+            result = value
+        else:
+            try:
+                result = float(value)
+            except (TypeError, ValueError):
+                return None
+        # NaN es el único valor distinto de sí mismo.
+        return result if result == result and result != _INF and result != -_INF else None
 
     @staticmethod
     def _get_last_indicator(df: pd.DataFrame, column: str) -> float:
         if column not in df:
             return float("nan")
-        series = df[column].dropna()
+        column_values = df[column]
+        # Caso habitual: la última vela ya tiene valor y no hace falta recorrer la serie.
+        last = float(column_values.iloc[-1]) if len(column_values) else float("nan")
+        if last == last:
+            return last
+        series = column_values.dropna()
         if series.empty:
             return float("nan")
         return float(series.iloc[-1])
+
+
+_worker_engine: Optional[SignalEngine] = None
+
+
+def _init_scan_worker(key_levels_cache_dir: str) -> None:
+    global _worker_engine
+    _worker_engine = SignalEngine(max_workers=1, key_levels_cache_dir=key_levels_cache_dir)
+
+
+def _scan_symbol_in_worker(symbol: str, btc_context: Dict[str, object]) -> List[Signal]:
+    assert _worker_engine is not None
+    return _worker_engine._scan_symbol(symbol, btc_context)
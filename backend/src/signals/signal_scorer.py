@@ -1,14 +1,102 @@
 from __future__ import annotations
 
 import math
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .confluence_detector import ConfluenceDetector
 
+_COMMON_CONFLUENCE_NAMES: Tuple[str, ...] = ("poc_weekly", "poc_daily", "vwap", "vwap_session", "ema_50", "val", "vah")
+_LONG_CONFLUENCE_NAMES: Tuple[str, ...] = _COMMON_CONFLUENCE_NAMES + ("swing_support", "pdl", "pwl")
+_SHORT_CONFLUENCE_NAMES: Tuple[str, ...] = _COMMON_CONFLUENCE_NAMES + ("swing_resistance", "pdh", "pwh")
+
+# Indexado por el nivel devuelto por `_combine_scores`.
+_CONFIDENCE_LABELS: Tuple[str, ...] = ("BAJA", "MEDIA", "ALTA")
+
+
+_NAN = float("nan")
+
+
+def _finite_or_nan(value: object) -> float:
+    try:
+        result = float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return _NAN
+    return result if math.isfinite(result) else _NAN
+
+
+def _is_near(price: float, level: float, tolerance: float) -> bool:
+    # Los niveles ausentes son NaN y cualquier comparación con NaN es False.
+    return level > 0 and abs(price - level) / max(level, 1e-8) <= tolerance
+
+
+@dataclass(frozen=True, slots=True)
+class ScoringLevels:
+    """Key levels e indicadores del símbolo ya convertidos a float (NaN si faltan)."""
+
+    poc_weekly: float = _NAN
+    poc_daily: float = _NAN
+    vah: float = _NAN
+    val: float = _NAN
+    pdh: float = _NAN
+    pdl: float = _NAN
+    pwh: float = _NAN
+    pwl: float = _NAN
+    vwap: float = _NAN
+    vwap_session: float = _NAN
+    ema_50: float = _NAN
+
+    @classmethod
+    def from_context(
+        cls,
+        key_levels: Dict[str, Optional[float]],
+        indicator_context: Dict[str, Optional[float]],
+    ) -> "ScoringLevels":
+        return cls(
+            poc_weekly=_finite_or_nan(key_levels.get("poc_weekly")),
+            poc_daily=_finite_or_nan(key_levels.get("poc_daily")),
+            vah=_finite_or_nan(key_levels.get("vah")),
+            val=_finite_or_nan(key_levels.get("val")),
+            pdh=_finite_or_nan(key_levels.get("pdh")),
+            pdl=_finite_or_nan(key_levels.get("pdl")),
+            pwh=_finite_or_nan(key_levels.get("pwh")),
+            pwl=_finite_or_nan(key_levels.get("pwl")),
+            vwap=_finite_or_nan(indicator_context.get("vwap")),
+            vwap_session=_finite_or_nan(indicator_context.get("vwap_session")),
+            ema_50=_finite_or_nan(indicator_context.get("ema_50")),
+        )
+
+    def common_confluence_values(self) -> np.ndarray:
+        """Valores en el orden de `_COMMON_CONFLUENCE_NAMES`."""
+        return np.array(
+            [self.poc_weekly, self.poc_daily, self.vwap, self.vwap_session, self.ema_50, self.val, self.vah],
+            dtype=float,
+        )
+
+
+def _combine_scores(
+    base_score: float,
+    confluence_multiplier: float,
+    confluence_bonus: float,
+    btc_multiplier: float,
+    other_bonuses: float,
+) -> Tuple[float, int]:
+    """Score final y nivel de confianza (0=BAJA, 1=MEDIA, 2=ALTA)."""
+    final_score = (base_score * confluence_multiplier + confluence_bonus) * btc_multiplier + other_bonuses
+    if final_score >= 110.0:
+        return final_score, 2
+    if final_score >= 85.0:
+        return final_score, 1
+    return final_score, 0
+
 
 class SignalScorer:
     """Sistema de scoring avanzado para señales."""
 
+    ALERT_THRESHOLD: float = 60.0
+
     def __init__(self, confluence_detector: Optional[ConfluenceDetector] = None) -> None:
         self.confluence_detector = confluence_detector or ConfluenceDetector()
 
@@ -21,107 +109,101 @@ class SignalScorer:
         key_levels: Dict[str, Optional[float]],
         indicator_context: Dict[str, Optional[float]],
     ) -> Dict[str, object]:
-        direction = str(setup.get("direction", "LONG")).upper()
-
-        base_components = self._calculate_base_components(direction, setup, current_price, key_levels, indicator_context)
-        base_score = sum(base_components.values())
-        base_score = min(base_score, 80.0)
-
-        confluence_levels = self._build_confluence_levels(direction, setup, key_levels, indicator_context)
-        confluence_data = self.confluence_detector.detect_confluences(current_price, confluence_levels)
-        confluence_bonus = self._calculate_confluence_bonus(confluence_data)
-        base_with_multiplier = base_score * float(confluence_data.get("multiplier", 1.0))
+        return self.calculate_final_scores(
+            [setup], btc_context, symbol, current_price, key_levels, indicator_context
+        )[0]
 
-        btc_multiplier = self._select_multiplier(direction, btc_context)
-
-        session_quality = str(btc_context.get("session_quality", "BAJA"))
-        session_bonus = self._calculate_session_bonus(session_quality)
-        correlation_bonus = self._calculate_correlation_bonus(symbol, btc_context, direction)
-        divergence_bonus = int(setup.get("divergence", {}).get("bonus_score", 0)) if setup.get("divergence") else 0
-
-        other_bonuses = session_bonus + correlation_bonus + divergence_bonus
-        penalties = 0
-
-        final_score = (base_with_multiplier + confluence_bonus) * btc_multiplier + other_bonuses
-        confidence = self._determine_confidence(final_score)
-        should_alert = final_score >= 60
-
-        return {
-            "final_score": round(final_score, 2),
-            "base_score": round(base_score, 2),
-            "btc_multiplier": round(btc_multiplier, 2),
-            "bonus": int(other_bonuses + confluence_bonus),
-            "penalties": int(penalties),
-            "confidence": confidence,
-            "should_alert": should_alert,
-            "confluence": {
-                "count": int(confluence_data.get("count", 0)),
-                "levels": list(confluence_data.get("levels", [])),
-                "multiplier": float(confluence_data.get("multiplier", 1.0)),
-                "bonus": int(confluence_bonus),
-            },
-            "base_components": base_components,
-            "session_bonus": session_bonus,
-            "correlation_bonus": correlation_bonus,
-            "divergence_bonus": divergence_bonus,
-        }
-
-    def _calculate_base_components(
+    def calculate_final_scores(
         self,
-        direction: str,
-        setup: Dict[str, object],
+        setups: Sequence[Dict[str, object]],
+        btc_context: Dict[str, object],
+        symbol: str,
         current_price: float,
         key_levels: Dict[str, Optional[float]],
         indicator_context: Dict[str, Optional[float]],
-    ) -> Dict[str, float]:
-        structure = self._structure_score(direction, setup, current_price, key_levels)
-        order_flow = self._order_flow_score(setup)
-        patterns = self._pattern_score(setup)
-        liquidity = self._liquidity_score(setup)
-        key_level_score = self._key_level_score(direction, current_price, key_levels, indicator_context)
-
-        return {
-            "structure": structure,
-            "order_flow": order_flow,
-            "patterns": patterns,
-            "liquidity": liquidity,
-            "key_levels": key_level_score,
-        }
+    ) -> List[Dict[str, object]]:
+        """Puntúa varios setups del mismo símbolo y vela en una sola llamada.
+
+        Los términos que no dependen de la dirección (sesión, POC semanal y niveles
+        comunes de confluencia) se calculan una vez y se comparten entre setups.
+        """
+        session_quality = str(btc_context.get("session_quality", "BAJA"))
+        session_bonus = self._calculate_session_bonus(session_quality)
+        levels = ScoringLevels.from_context(key_levels, indicator_context)
+        poc_bonus = 5.0 if _is_near(current_price, levels.poc_weekly, 0.005) else 0.0
+        common_values = levels.common_confluence_values()
+
+        results: List[Dict[str, object]] = []
+        for setup in setups:
+            direction = str(setup.get("direction", "LONG")).upper()
+
+            base_components = {
+                "structure": self._structure_score(direction, setup, current_price, poc_bonus),
+                "order_flow": self._order_flow_score(setup),
+                "patterns": self._pattern_score(setup),
+                "liquidity": self._liquidity_score(setup),
+                "key_levels": self._key_level_score(direction, current_price, levels),
+            }
+            base_score = sum(base_components.values())
+            base_score = min(base_score, 80.0)
+
+            level_names, level_values = self._build_confluence_levels(direction, setup, levels, common_values)
+            confluence_data = self.confluence_detector.detect_confluences_array(current_price, level_names, level_values)
+            confluence_bonus = self._calculate_confluence_bonus(confluence_data)
+
+            btc_multiplier = self._select_multiplier(direction, btc_context)
+
+            correlation_bonus = self._calculate_correlation_bonus(symbol, btc_context, direction)
+            divergence_bonus = int(setup.get("divergence", {}).get("bonus_score", 0)) if setup.get("divergence") else 0
+
+            other_bonuses = session_bonus + correlation_bonus + divergence_bonus
+            penalties = 0
+
+            final_score, confidence_level = _combine_scores(
+                float(base_score),
+                float(confluence_data.get("multiplier", 1.0)),
+                float(confluence_bonus),
+                float(btc_multiplier),
+                float(other_bonuses),
+            )
+            confidence = _CONFIDENCE_LABELS[confidence_level]
+            should_alert = final_score >= self.ALERT_THRESHOLD
+
+            results.append(
+                {
+                    "final_score": round(final_score, 2),
+                    "base_score": round(base_score, 2),
+                    "btc_multiplier": round(btc_multiplier, 2),
+                    "bonus": int(other_bonuses + confluence_bonus),
+                    "penalties": int(penalties),
+                    "confidence": confidence,
+                    "should_alert": should_alert,
+                    "confluence": {
+                        "count": int(confluence_data.get("count", 0)),
+                        "levels": list(confluence_data.get("levels", [])),
+                        "multiplier": float(confluence_data.get("multiplier", 1.0)),
+                        "bonus": int(confluence_bonus),
+                    },
+                    "base_components": base_components,
+                    "session_bonus": session_bonus,
+                    "correlation_bonus": correlation_bonus,
+                    "divergence_bonus": divergence_bonus,
+                }
+            )
+
+        return results
 
     def _structure_score(
         self,
         direction: str,
         setup: Dict[str, object],
         current_price: float,
-        key_levels: Dict[str, Optional[float]],
+        poc_bonus: float,
     ) -> float:
-        score = 0.0
-        support_tolerance = 0.01
-        poc_tolerance = 0.005
-
-        if direction == "LONG":
-            support = self._to_float(setup.get("support_level"))
-            if support and support > 0:
-                distance = abs(current_price - support) / max(support, 1e-8)
-                if distance <= support_tolerance:
-                    score += 15
-            poc_weekly = self._to_float(key_levels.get("poc_weekly"))
-            if poc_weekly and poc_weekly > 0:
-                distance_poc = abs(current_price - poc_weekly) / max(poc_weekly, 1e-8)
-                if distance_poc <= poc_tolerance:
-                    score += 5
-        else:
-            resistance = self._to_float(setup.get("resistance_level"))
-            if resistance and resistance > 0:
-                distance = abs(current_price - resistance) / max(resistance, 1e-8)
-                if distance <= support_tolerance:
-                    score += 15
-            poc_weekly = self._to_float(key_levels.get("poc_weekly"))
-            if poc_weekly and poc_weekly > 0:
-                distance_poc = abs(current_price - poc_weekly) / max(poc_weekly, 1e-8)
-                if distance_poc <= poc_tolerance:
-                    score += 5
-
+        level_key = "support_level" if direction == "LONG" else "resistance_level"
+        score = poc_bonus
+        if _is_near(current_price, _finite_or_nan(setup.get(level_key)), 0.01):
+            score += 15
         return min(score, 20.0)
 
     def _order_flow_score(self, setup: Dict[str, object]) -> float:
@@ -137,69 +219,39 @@ class SignalScorer:
         extra = 5.0 if setup.get("previous_extreme_sweep") else 0.0
         return float(min(15.0, base + extra))
 
-    def _key_level_score(
-        self,
-        direction: str,
-        current_price: float,
-        key_levels: Dict[str, Optional[float]],
-        indicator_context: Dict[str, Optional[float]],
-    ) -> float:
+    def _key_level_score(self, direction: str, current_price: float, levels: ScoringLevels) -> float:
         score = 0.0
         tolerance_value_area = 0.005
         tolerance_vwap = 0.002
 
-        vwap = self._to_float(indicator_context.get("vwap"))
-
         if direction == "LONG":
-            val = self._to_float(key_levels.get("val"))
-            if val and val > 0:
-                distance = abs(current_price - val) / max(val, 1e-8)
-                if distance <= tolerance_value_area:
-                    score += 10
-            if vwap and vwap > 0:
-                distance_vwap = abs(current_price - vwap) / max(vwap, 1e-8)
-                if distance_vwap <= tolerance_vwap:
-                    score += 5
+            if _is_near(current_price, levels.val, tolerance_value_area):
+                score += 10
+            if _is_near(current_price, levels.vwap, tolerance_vwap):
+                score += 5
         else:
-            vah = self._to_float(key_levels.get("vah"))
-            if vah and vah > 0:
-                distance = abs(current_price - vah) / max(vah, 1e-8)
-                if distance <= tolerance_value_area:
-                    score += 10
-            if vwap and vwap > 0 and current_price <= vwap:
-                distance_vwap = abs(current_price - vwap) / max(vwap, 1e-8)
-                if distance_vwap <= tolerance_vwap:
-                    score += 5
+            if _is_near(current_price, levels.vah, tolerance_value_area):
+                score += 10
+            if current_price <= levels.vwap and _is_near(current_price, levels.vwap, tolerance_vwap):
+                score += 5
 
         return float(min(score, 15.0))
 
+    @staticmethod
     def _build_confluence_levels(
-        self,
         direction: str,
         setup: Dict[str, object],
-        key_levels: Dict[str, Optional[float]],
-        indicator_context: Dict[str, Optional[float]],
-    ) -> Dict[str, Optional[float]]:
-        levels: Dict[str, Optional[float]] = {
-            "poc_weekly": key_levels.get("poc_weekly"),
-            "poc_daily": key_levels.get("poc_daily"),
-            "vwap": indicator_context.get("vwap"),
-            "vwap_session": indicator_context.get("vwap_session"),
-            "ema_50": indicator_context.get("ema_50"),
-            "val": key_levels.get("val"),
-            "vah": key_levels.get("vah"),
-        }
-
+        levels: ScoringLevels,
+        common_values: np.ndarray,
+    ) -> Tuple[Tuple[str, ...], np.ndarray]:
         if direction == "LONG":
-            levels["swing_support"] = setup.get("support_level")
-            levels["pdl"] = key_levels.get("pdl")
-            levels["pwl"] = key_levels.get("pwl")
+            names = _LONG_CONFLUENCE_NAMES
+            side_values = (_finite_or_nan(setup.get("support_level")), levels.pdl, levels.pwl)
         else:
-            levels["swing_resistance"] = setup.get("resistance_level")
-            levels["pdh"] = key_levels.get("pdh")
-            levels["pwh"] = key_levels.get("pwh")
+            names = _SHORT_CONFLUENCE_NAMES
+            side_values = (_finite_or_nan(setup.get("resistance_level")), levels.pdh, levels.pwh)
 
-        return levels
+        return names, np.concatenate((common_values, np.array(side_values, dtype=float)))
 
     @staticmethod
     def _calculate_confluence_bonus(confluence_data: Dict[str, object]) -> float:
@@ -236,14 +288,6 @@ class SignalScorer:
             return 10 if direction == "SHORT" else -15
         return 0
 
-    @staticmethod
-    def _determine_confidence(score: float) -> str:
-        if score >= 110:
-            return "ALTA"
-        if score >= 85:
-            return "MEDIA"
-        return "BAJA"
-
     @staticmethod
     def _to_float(value: object) -> Optional[float]:
         if value is None:
@@ -0,0 +1,52 @@
+"""CRC32C (Castagnoli) checksums for persisted numeric payloads."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .jit import njit
+
+try:  # pragma: no cover - depends on the optional dependency being installed
+    import google_crc32c
+except ImportError:  # pragma: no cover
+    google_crc32c = None
+
+
+def _build_crc32c_table() -> np.ndarray:
+    table = np.empty(256, dtype=np.uint32)
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table[byte] = crc
+    return table
+
+
+_CRC32C_TABLE = _build_crc32c_table()
+
+
+@njit(cache=True)
+def _crc32c_rows_table_driven(rows: np.ndarray, table: np.ndarray) -> np.ndarray:
+    out = np.empty(rows.shape[0], dtype=np.int64)
+    for i in range(rows.shape[0]):
+        # Plain int arithmetic: under NumPy 2 (NEP 50) promotion ``0xFFFFFFFF ^ np.uint8`` overflows.
+        crc = 0xFFFFFFFF
+        for byte in rows[i]:
+            crc = int(table[(crc ^ int(byte)) & 0xFF]) ^ (crc >> 8)
+        out[i] = crc ^ 0xFFFFFFFF
+    return out
+
+
+def crc32c_rows(rows: np.ndarray) -> np.ndarray:
+    """CRC32C of every row of a 2-D ``uint8`` array, as ``int64``."""
+    rows = np.ascontiguousarray(rows, dtype=np.uint8)
+    if google_crc32c is not None:
+        return np.fromiter((google_crc32c.value(row.tobytes()) for row in rows), dtype=np.int64, count=len(rows))
+    return _crc32c_rows_table_driven(rows, _CRC32C_TABLE)
+
+
+def crc32c(data: bytes) -> int:
+    """CRC32C of ``data``; uses the hardware-accelerated ``google-crc32c`` when installed."""
+    if google_crc32c is not None:
+        return int(google_crc32c.value(data))
+    return int(crc32c_rows(np.frombuffer(data, dtype=np.uint8).reshape(1, -1))[0])
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Optional, Tuple
 
 import pandas as pd
 
 
 def require_columns(df: pd.DataFrame, required: Iterable[str]) -> None:
     """Ensure the dataframe contains the required columns."""
-    missing = [col for col in required if col not in df.columns]
+    columns = set(df.columns)
+    missing = [col for col in required if col not in columns]
     if missing:
         raise ValueError(f"DataFrame missing required columns: {missing}")
 
@@ -20,6 +21,22 @@ def ensure_datetime_index(df: pd.DataFrame, datetime_column: str = "datetime") -
     if datetime_column not in df.columns:
         raise ValueError("DataFrame must have a DatetimeIndex or a datetime column")
 
-    indexed = df.copy()
-    indexed.index = pd.to_datetime(indexed[datetime_column], utc=True)
-    return indexed
+    index = pd.to_datetime(df[datetime_column], utc=True)
+    # set_axis shares the column blocks with the original frame instead of copying them.
+    return df.set_axis(index, axis=0, copy=False)
+
+
+BAR_SIGNATURE_COLUMNS: Tuple[str, ...] = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+def last_bar_signature(df: pd.DataFrame) -> Optional[Tuple[object, ...]]:
+    """
+    Cache key for a candle frame: its length plus the last row's OHLCV values.
+
+    The still-forming candle is upserted under the same timestamp, so keying on the
+    timestamp alone would keep serving results computed from an outdated close.
+    """
+    if df is None or df.empty or "timestamp" not in df.columns:
+        return None
+    columns = [column for column in BAR_SIGNATURE_COLUMNS if column in df.columns]
+    return (len(df), *df[columns].iloc[-1].tolist())
@@ -0,0 +1,26 @@
+"""Optional Numba support for numeric kernels."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:  # pragma: no cover - depends on the optional dependency being installed
+    from numba import njit as _numba_njit
+except ImportError:  # pragma: no cover
+    _numba_njit = None
+
+NUMBA_AVAILABLE = _numba_njit is not None
+
+
+def njit(*args: Any, **kwargs: Any) -> Callable:
+    """Compile with ``numba.njit`` when available; otherwise return the function unchanged."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func: Callable) -> Callable:
+        return func
+
+    return decorator
@@ -14,7 +14,9 @@ def _configure_root_logger(level: int = logging.INFO) -> None:
     root_logger.setLevel(level)
 
 
+_configure_root_logger()
+
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
-    """Return a module-level logger with standard configuration."""
-    _configure_root_logger()
+    """Return a module-level logger; the root logger is configured once at import."""
     return logging.getLogger(name)
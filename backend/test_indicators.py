@@ -2,23 +2,77 @@
 
 from __future__ import annotations
 
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
 from src.config import settings
 from src.data.data_storage import DataStorage
 from src.indicators.market_structure import MarketStructure
 from src.indicators.technical_indicators import TechnicalIndicators
 
+# Caché en disco entre ejecuciones del script; cualquier escritura en la base la invalida.
+CACHE_DIR = Path(os.getenv("INDICATORS_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache" / "indicators")))
+
+
+def _db_mtime() -> int:
+    return os.stat(settings.DB_PATH).st_mtime_ns if os.path.exists(settings.DB_PATH) else 0
+
+
+def _cache_path(symbol: str, timeframe: str, limit: int) -> Path:
+    return CACHE_DIR / f"{symbol.replace('/', '_')}_{timeframe}_{limit}.pkl"
+
+
+def _read_cache(path: Path, db_mtime: int) -> pd.DataFrame | None:
+    try:
+        with path.open("rb") as handle:
+            entry = pickle.load(handle)
+    except Exception:
+        return None
+    if not isinstance(entry, dict) or entry.get("db_mtime") != db_mtime:
+        return None
+    return entry.get("df")
+
+
+def _write_cache(path: Path, db_mtime: int, df: pd.DataFrame) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: una ejecución concurrente nunca ve un pickle a medio escribir.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump({"db_mtime": db_mtime, "df": df}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except OSError as exc:
+        print(f"⚠️ No se pudo guardar la caché de indicadores: {exc}")
+
+
+def load_indicators(symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+    """OHLCV con indicadores, reutilizando la caché en disco si la base no cambió."""
+    db_mtime = _db_mtime()
+    path = _cache_path(symbol, timeframe, limit)
+    cached = _read_cache(path, db_mtime)
+    if cached is not None:
+        return cached
+
+    df = DataStorage(settings.DB_PATH).get_ohlcv(symbol, timeframe, limit=limit)
+    if df.empty:
+        return df
+
+    df = TechnicalIndicators().add_all_indicators(df)
+    _write_cache(path, db_mtime, df)
+    return df
+
 
 def main() -> None:
-    storage = DataStorage(settings.DB_PATH)
-    df = storage.get_ohlcv("BTC/USDT", "4h", limit=200)
+    df = load_indicators("BTC/USDT", "4h", 200)
 
     if df.empty:
         print("⚠️ No hay datos OHLCV almacenados para BTC/USDT 4h.")
         return
 
-    ti = TechnicalIndicators()
-    df = ti.add_all_indicators(df)
-
     ms = MarketStructure()
     df = ms.detect_swing_points(df)
     sr = ms.identify_support_resistance(df)
@@ -27,10 +81,11 @@ def main() -> None:
     print("\n📊 BTC/USDT 4H - Últimas 5 velas con indicadores:")
     columns = ["datetime", "close", "ema_20", "ema_50", "atr", "adx", "rsi"]
     available = [col for col in columns if col in df.columns]
-    display_df = df[available].tail().copy()
-    if "datetime" in display_df.columns:
-        display_df["datetime"] = display_df["datetime"].dt.strftime("%Y-%m-%d %H:%M")
-    print(display_df.to_string(index=False))
+    display_df = df[available].tail()
+    formatters = None
+    if "datetime" in available:
+        formatters = {"datetime": lambda ts: "" if pd.isna(ts) else ts.strftime("%Y-%m-%d %H:%M")}
+    print(display_df.to_string(index=False, formatters=formatters))
 
     print(f"\n📈 Tendencia: {trend['trend']}")
     print(f"   Fuerza: {trend['trend_strength']:.1f}")
@@ -1,6 +1,9 @@
 import sys
 from pathlib import Path
+from typing import Callable, Dict
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from data.exchange_client import BinanceClient
@@ -10,8 +13,36 @@ if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
 
-@pytest.fixture(scope="module")
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "serial: usa la red de Binance; ejecutar fuera de pytest-xdist")
+    config.addinivalue_line("markers", "slow: comparaciones contra el oráculo de pandas (índice y dtype)")
+
+
+@pytest.fixture(scope="session")
 def binance_client() -> BinanceClient:
-    client = BinanceClient(max_retries=3, retry_delay=1)
-    client.client.load_markets()
-    return client
+    return BinanceClient(max_retries=3, retry_delay=1)
+
+
+def _build_sample_ohlcv(rows: int) -> pd.DataFrame:
+    base = pd.date_range("2024-01-01", periods=rows, freq="H", tz="UTC")
+    data = {
+        "open": np.linspace(100, 110, rows),
+        "high": np.linspace(101, 112, rows),
+        "low": np.linspace(99, 108, rows),
+        "close": np.linspace(100, 111, rows),
+        "volume": np.linspace(10, 20, rows),
+    }
+    return pd.DataFrame(data, index=base)
+
+
+@pytest.fixture(scope="module")
+def sample_ohlcv_factory() -> Callable[[int], pd.DataFrame]:
+    """Frames OHLCV horarios por número de filas, construidos una vez por módulo (copias superficiales)."""
+    cache: Dict[int, pd.DataFrame] = {}
+
+    def make(rows: int = 10) -> pd.DataFrame:
+        if rows not in cache:
+            cache[rows] = _build_sample_ohlcv(rows)
+        return cache[rows].copy(deep=False)
+
+    return make
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals.btc_filter import BTCFilter
+
+
+def _frame(rows: int, step: int) -> pd.DataFrame:
+    close = np.linspace(26000.0, 26500.0, rows)
+    return pd.DataFrame(
+        {
+            "timestamp": np.arange(rows) * step,
+            "open": close,
+            "high": close + 50,
+            "low": close - 50,
+            "close": close,
+            "volume": np.full(rows, 100.0),
+            "atr": np.full(rows, 120.0),
+            "adx": np.full(rows, 30.0),
+        }
+    )
+
+
+def test_context_cache_follows_upserted_forming_candle(monkeypatch: pytest.MonkeyPatch) -> None:
+    btc_filter = BTCFilter()
+    calls = []
+
+    def fake_trend(df: pd.DataFrame) -> dict[str, object]:
+        calls.append(len(df))
+        return {"trend": "ALCISTA_FUERTE", "trend_strength": 70.0}
+
+    monkeypatch.setattr(btc_filter, "_get_trend_from_df", fake_trend)
+    df_4h, df_1h = _frame(30, 4 * 3600), _frame(30, 3600)
+
+    first = btc_filter.analyze_btc_context(df_4h, df_1h)
+    btc_filter.analyze_btc_context(df_4h, df_1h)
+    assert len(calls) == 1
+
+    # Misma vela 1H (mismo timestamp) con un cierre actualizado.
+    updated_1h = df_1h.copy()
+    updated_1h.loc[updated_1h.index[-1], "close"] = 27000.0
+    refreshed = btc_filter.analyze_btc_context(df_4h, updated_1h)
+
+    assert len(calls) == 2
+    assert first["current_price"] == 26500.0
+    assert refreshed["current_price"] == 27000.0
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import numpy as np
+
+from utils.checksum import _CRC32C_TABLE, _crc32c_rows_table_driven, crc32c
+
+
+def test_crc32c_matches_reference_vector() -> None:
+    assert crc32c(b"") == 0
+    assert crc32c(b"123456789") == 0xE3069283
+
+
+def test_crc32c_detects_single_value_change() -> None:
+    values = np.linspace(-5.0, 5.0, 200)
+    altered = values.copy()
+    altered[100] = np.nextafter(altered[100], np.inf)
+
+    assert crc32c(values.tobytes()) != crc32c(altered.tobytes())
+
+
+def test_table_driven_fallback_matches_reference_vector() -> None:
+    kernel = getattr(_crc32c_rows_table_driven, "py_func", _crc32c_rows_table_driven)
+    rows = np.frombuffer(b"123456789", dtype=np.uint8).reshape(1, -1)
+
+    assert kernel(rows, _CRC32C_TABLE).tolist() == [0xE3069283]
+    assert _crc32c_rows_table_driven(rows, _CRC32C_TABLE).tolist() == [0xE3069283]
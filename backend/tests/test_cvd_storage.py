@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from data.cvd_storage import _SQL_IN_CHUNK, CVDStorage
+
+
+def test_verify_cvd_flags_rows_whose_values_changed(tmp_path: Path) -> None:
+    db_path = tmp_path / "cvd.db"
+    storage = CVDStorage(str(db_path))
+    storage.save_cvd("BTC/USDT", "1h", np.array([0, 3600, 7200]), np.array([1.0, -2.0, 4.0]), np.array([1.0, -1.0, 3.0]))
+    # Una segunda ejecución solapada reescribe una fila existente y añade otra.
+    storage.save_cvd("BTC/USDT", "1h", np.array([7200, 10800]), np.array([5.0, 1.0]), np.array([4.0, 5.0]))
+
+    assert storage.verify_cvd("BTC/USDT", "1h") == []
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("UPDATE cvd_data SET cvd_cumulative = 99.0 WHERE timestamp = 3600")
+
+    assert storage.verify_cvd("BTC/USDT", "1h") == [3600]
+
+
+def test_existing_table_gets_checksum_column(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE cvd_data (id INTEGER PRIMARY KEY, symbol VARCHAR NOT NULL, timeframe VARCHAR NOT NULL, "
+            "timestamp INTEGER NOT NULL, cvd_period FLOAT NOT NULL, cvd_cumulative FLOAT NOT NULL, "
+            "created_at DATETIME NOT NULL, CONSTRAINT uix_cvd_symbol_timeframe_ts UNIQUE (symbol, timeframe, timestamp))"
+        )
+        connection.execute(
+            "INSERT INTO cvd_data (symbol, timeframe, timestamp, cvd_period, cvd_cumulative, created_at) "
+            "VALUES ('BTC/USDT', '1h', 0, 1.0, 1.0, '2024-01-01 00:00:00')"
+        )
+
+    storage = CVDStorage(str(db_path))
+    CVDStorage(str(db_path))  # la migración es idempotente
+    storage.save_cvd("BTC/USDT", "1h", [3600], [2.0], [3.0])
+
+    with sqlite3.connect(db_path) as connection:
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(cvd_data)")]
+        checksums = connection.execute("SELECT timestamp, checksum FROM cvd_data ORDER BY timestamp").fetchall()
+
+    assert "checksum" in columns
+    assert checksums[0] == (0, None)
+    assert checksums[1][1] is not None
+    assert storage.verify_cvd("BTC/USDT", "1h") == []
+
+
+def test_save_cvd_bulk_inserts_and_overwrites_existing_rows(tmp_path: Path) -> None:
+    storage = CVDStorage(str(tmp_path / "cvd.db"))
+
+    stored = storage.save_cvd_bulk(
+        [
+            {
+                "symbol": "BTC/USDT",
+                "timeframe": "1h",
+                "timestamps": np.array([0, 3600]),
+                "cvd_period": np.array([1.0, 2.0]),
+                "cvd_cumulative": np.array([1.0, 3.0]),
+            },
+            {
+                "symbol": "ETH/USDT",
+                "timeframe": "4h",
+                "timestamps": [0],
+                "cvd_period": [5.0],
+                "cvd_cumulative": [5.0],
+            },
+        ]
+    )
+    assert stored == 3
+
+    overwritten = storage.save_cvd_bulk(
+        [
+            {
+                "symbol": "BTC/USDT",
+                "timeframe": "1h",
+                "timestamps": np.array([3600, 7200]),
+                "cvd_period": np.array([-4.0, 1.0]),
+                "cvd_cumulative": np.array([-3.0, -2.0]),
+            }
+        ]
+    )
+    assert overwritten == 2
+
+    btc = storage.get_cvd("BTC/USDT", "1h")
+    assert btc["timestamp"].tolist() == [0, 3600, 7200]
+    assert btc["cvd_period"].tolist() == [1.0, -4.0, 1.0]
+    assert btc["cvd_cumulative"].tolist() == [1.0, -3.0, -2.0]
+    assert storage.get_cvd("ETH/USDT", "4h")["cvd_cumulative"].tolist() == [5.0]
+    assert storage.save_cvd_bulk([]) == 0
+
+
+def test_get_cvd_for_timestamps_aligns_across_chunks_with_gaps(tmp_path: Path) -> None:
+    storage = CVDStorage(str(tmp_path / "cvd.db"))
+    stored_ts = np.arange(1200, dtype=np.int64) * 60
+    keep = stored_ts % 7 != 0  # huecos: cada séptima vela no tiene CVD
+    cumulative = stored_ts.astype(float) / 60
+    storage.save_cvd("BTC/USDT", "1m", stored_ts[keep], np.ones(keep.sum()), cumulative[keep])
+    storage.save_cvd("BTC/USDT", "5m", [0], [1.0], [-1.0])
+
+    # Más claves que el tamaño de chunk del IN, desordenadas, con duplicados y valores inexistentes.
+    wanted = np.concatenate([stored_ts[::-1], [60, 60, 10**9, -60]])
+    result = storage.get_cvd_for_timestamps("BTC/USDT", "1m", wanted)
+
+    expected = np.where(wanted % 7 == 0, np.nan, wanted / 60)
+    expected[(wanted < 0) | (wanted >= 1200 * 60)] = np.nan
+    np.testing.assert_array_equal(result, expected)
+    assert len(wanted) > _SQL_IN_CHUNK
+
+    with_missing = storage.get_cvd_for_timestamps("BTC/USDT", "1m", [None, 120.0, float("nan")])
+    np.testing.assert_array_equal(with_missing, [np.nan, 2.0, np.nan])
@@ -5,6 +5,7 @@ from data.data_fetcher import DataFetcher
 from data.exchange_client import BinanceClient
 
 
+@pytest.mark.serial
 def test_fetch_historical_data_multiple_symbols(binance_client: BinanceClient) -> None:
     fetcher = DataFetcher(binance_client)
     symbols = ["BTC/USDT", "ETH/USDT"]
@@ -2,8 +2,11 @@ import pytest
 
 from data.exchange_client import BinanceClient
 
+pytestmark = pytest.mark.serial
+
 
 def test_binance_client_connection(binance_client: BinanceClient) -> None:
+    binance_client.client.load_markets()
     assert "BTC/USDT" in binance_client.client.symbols
 
 
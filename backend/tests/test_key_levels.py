@@ -1,20 +1,45 @@
 from __future__ import annotations
 
 from datetime import timedelta
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from indicators.key_levels import (
     calculate_poc,
     calculate_value_area,
+    calculate_volume_profile,
     get_previous_period_extremes,
     get_session_extremes,
 )
 
 
+_HOUR_NS = 3600 * 10**9
+
+
+@lru_cache(maxsize=32)
+def _hourly_index(periods: int, start: str = "2024-01-01") -> tuple[pd.DatetimeIndex, np.ndarray]:
+    start_ns = pd.Timestamp(start, tz="UTC").value
+    nanos = np.arange(start_ns, start_ns + periods * _HOUR_NS, _HOUR_NS, dtype="int64")
+    timestamps = nanos // 10**9
+    timestamps.setflags(write=False)
+    return pd.DatetimeIndex(nanos, tz="UTC"), timestamps
+
+
+def _piecewise(*segments: tuple[int, float | np.ndarray]) -> np.ndarray:
+    """Fill one preallocated array with consecutive constant or array segments."""
+    result = np.empty(sum(size for size, _ in segments))
+    start = 0
+    for size, value in segments:
+        result[start : start + size] = value
+        start += size
+    return result
+
+
 def _prepare_dataframe(prices: np.ndarray, volumes: np.ndarray, start: str = "2024-01-01") -> pd.DataFrame:
-    index = pd.date_range(start, periods=len(prices), freq="H", tz="UTC")
+    index, timestamps = _hourly_index(len(prices), start)
     df = pd.DataFrame(
         {
             "open": prices,
@@ -22,68 +47,76 @@ def _prepare_dataframe(prices: np.ndarray, volumes: np.ndarray, start: str = "20
             "low": prices - 0.5,
             "close": prices,
             "volume": volumes,
+            "datetime": index,
+            "timestamp": timestamps,
         },
-        index=index,
+        copy=False,
     )
-    df["datetime"] = index
-    df["timestamp"] = (index.view("int64") // 10**9).astype(int)
     return df
 
 
-def test_calculate_poc_prefers_high_volume_zone() -> None:
-    prices = np.concatenate([np.ones(20) * 100, np.ones(20) * 120])
-    volumes = np.concatenate([np.ones(20) * 200, np.ones(20) * 50])
-    df = _prepare_dataframe(prices, volumes)
+@pytest.fixture(scope="module")
+def clustered_df() -> pd.DataFrame:
+    # Cluster principal de volumen en 98-102 y uno secundario, más ligero, en 118-122.
+    prices = _piecewise((30, np.linspace(98, 102, 30)), (10, np.linspace(118, 122, 10)))
+    volumes = _piecewise((30, 150), (10, 40))
+    return _prepare_dataframe(prices, volumes)
 
-    poc = calculate_poc(df, timedelta(days=7))
+
+def test_calculate_poc_prefers_high_volume_zone(clustered_df: pd.DataFrame) -> None:
+    poc = calculate_poc(clustered_df, timedelta(days=7))
 
     assert poc is not None
     assert abs(poc - 100) < 2  # debe estar cerca del cluster principal
 
 
-def test_value_area_contains_majority_volume() -> None:
-    prices = np.concatenate([
-        np.linspace(98, 102, 30),
-        np.linspace(118, 122, 10),
-    ])
-    volumes = np.concatenate([
-        np.ones(30) * 150,
-        np.ones(10) * 40,
-    ])
-    df = _prepare_dataframe(prices, volumes)
-
-    vah, val = calculate_value_area(df, timedelta(days=7))
-    poc = calculate_poc(df, timedelta(days=7))
+def test_value_area_contains_majority_volume(clustered_df: pd.DataFrame) -> None:
+    vah, val = calculate_value_area(clustered_df, timedelta(days=7))
+    poc = calculate_poc(clustered_df, timedelta(days=7))
 
     assert vah is not None and val is not None and poc is not None
     assert val <= poc <= vah
     assert vah - val < 10  # rango acotado alrededor del cluster principal
 
 
+def test_volume_profile_matches_individual_levels() -> None:
+    prices = _piecewise((150, np.linspace(98, 102, 150)), (48, np.linspace(110, 114, 48)))
+    volumes = _piecewise((150, 120), (48, 60))
+    df = _prepare_dataframe(prices, volumes)
+
+    weekly, daily = calculate_volume_profile(df, (timedelta(days=7), timedelta(days=1)))
+
+    assert weekly["poc"] == calculate_poc(df, timedelta(days=7))
+    assert daily["poc"] == calculate_poc(df, timedelta(days=1))
+    assert (weekly["vah"], weekly["val"]) == calculate_value_area(df, timedelta(days=7))
+
+
 def test_previous_period_extremes_detects_week_and_day() -> None:
     hours = 24 * 14
-    index = pd.date_range("2024-01-01", periods=hours, freq="H", tz="UTC")
+    index, timestamps = _hourly_index(hours)
     base_prices = np.linspace(95, 105, hours)
+
+    prev_week_mask = (index >= "2024-01-01") & (index < "2024-01-08")
+    prev_day_mask = (index >= "2024-01-13") & (index < "2024-01-14")
+    high = base_prices + 1
+    low = base_prices - 1
+    np.copyto(high, 150, where=prev_week_mask)
+    np.copyto(low, 60, where=prev_week_mask)
+    np.copyto(high, 140, where=prev_day_mask)
+    np.copyto(low, 70, where=prev_day_mask)
+
     df = pd.DataFrame(
         {
             "open": base_prices,
-            "high": base_prices + 1,
-            "low": base_prices - 1,
+            "high": high,
+            "low": low,
             "close": base_prices,
             "volume": np.ones(hours) * 100,
+            "datetime": index,
+            "timestamp": timestamps,
         },
-        index=index,
+        copy=False,
     )
-    df["datetime"] = index
-    df["timestamp"] = (index.view("int64") // 10**9).astype(int)
-
-    prev_week_mask = (df["datetime"] >= "2024-01-01") & (df["datetime"] < "2024-01-08")
-    df.loc[prev_week_mask, "high"] = 150
-    df.loc[prev_week_mask, "low"] = 60
-
-    prev_day_mask = (df["datetime"] >= "2024-01-13") & (df["datetime"] < "2024-01-14")
-    df.loc[prev_day_mask, "high"] = 140
-    df.loc[prev_day_mask, "low"] = 70
 
     extremes = get_previous_period_extremes(df)
 
@@ -94,32 +127,32 @@ def test_previous_period_extremes_detects_week_and_day() -> None:
 
 
 def test_session_extremes_returns_recent_sessions() -> None:
-    index = pd.date_range("2024-01-11", periods=24, freq="H", tz="UTC")
+    index, timestamps = _hourly_index(24, "2024-01-11")
     base_prices = np.linspace(100, 104, len(index))
+    high = base_prices + 1
+    low = base_prices - 1
+
+    hours = index.hour.to_numpy()
+    asia_mask = hours < 9
+    london_mask = (hours >= 7) & (hours < 16)
+    ny_mask = (hours >= 13) & (hours < 21)
+
+    high[asia_mask], low[asia_mask] = 112, 94
+    high[london_mask], low[london_mask] = 123, 97
+    high[ny_mask], low[ny_mask] = 131, 102
+
     df = pd.DataFrame(
         {
             "open": base_prices,
-            "high": base_prices + 1,
-            "low": base_prices - 1,
+            "high": high,
+            "low": low,
             "close": base_prices,
             "volume": np.ones(len(index)) * 80,
+            "datetime": index,
+            "timestamp": timestamps,
         },
-        index=index,
+        copy=False,
     )
-    df["datetime"] = index
-    df["timestamp"] = (index.view("int64") // 10**9).astype(int)
-
-    asia_mask = (df.index.hour >= 0) & (df.index.hour < 9)
-    df.loc[asia_mask, "high"] = 112
-    df.loc[asia_mask, "low"] = 94
-
-    london_mask = (df.index.hour >= 7) & (df.index.hour < 16)
-    df.loc[london_mask, "high"] = 123
-    df.loc[london_mask, "low"] = 97
-
-    ny_mask = (df.index.hour >= 13) & (df.index.hour < 21)
-    df.loc[ny_mask, "high"] = 131
-    df.loc[ny_mask, "low"] = 102
 
     sessions = get_session_extremes(df)
 
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from indicators.market_structure import MarketStructure
 
 
-def _swing_dataframe() -> pd.DataFrame:
+@pytest.fixture(scope="module")
+def swing_df() -> pd.DataFrame:
     prices = [100, 102, 101, 104, 103, 105, 104, 106, 105]
     highs = [p + 1 for p in prices]
     lows = [p - 1 for p in prices]
@@ -23,12 +25,11 @@ def _swing_dataframe() -> pd.DataFrame:
         },
         index=idx,
     )
-    df["datetime"] = idx
     return df
 
 
-def test_detect_swing_points_marks_local_extremes() -> None:
-    df = _swing_dataframe()
+def test_detect_swing_points_marks_local_extremes(swing_df: pd.DataFrame) -> None:
+    df = swing_df.copy()
     result = MarketStructure.detect_swing_points(df, window=2)
 
     expected_high_idx = result.index[3]
@@ -41,8 +42,8 @@ def test_detect_swing_points_marks_local_extremes() -> None:
     assert result.loc[expected_low_idx, "swing_low"] == result.loc[expected_low_idx, "low"]
 
 
-def test_identify_support_resistance_groups_levels() -> None:
-    df = _swing_dataframe()
+def test_identify_support_resistance_groups_levels(swing_df: pd.DataFrame) -> None:
+    df = swing_df.copy()
     df = MarketStructure.detect_swing_points(df, window=2)
 
     zones = MarketStructure.identify_support_resistance(df, tolerance=0.01, min_touches=1)
@@ -81,8 +82,8 @@ def test_determine_trend_identifies_bullish_structure() -> None:
     assert result["adx_value"] == df["adx"].iloc[-1]
 
 
-def test_determine_trend_returns_lateral_when_adx_low() -> None:
-    df = _swing_dataframe()
+def test_determine_trend_returns_lateral_when_adx_low(swing_df: pd.DataFrame) -> None:
+    df = swing_df.copy()
     df = MarketStructure.detect_swing_points(df, window=2)
 
     df["ema_20"] = df["close"] + 1
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from signals.pattern_detector import PatternDetector
 
+DETECTOR = PatternDetector()
+
 
 def _df_from_rows(rows: list[dict[str, float]]) -> pd.DataFrame:
     index = pd.date_range("2024-01-01", periods=len(rows), freq="H", tz="UTC")
-    df = pd.DataFrame(rows, index=index)
-    df["datetime"] = index
+    columns = {name: np.fromiter((row[name] for row in rows), dtype=np.float64, count=len(rows)) for name in rows[0]}
+    df = pd.DataFrame(columns, index=index, copy=False)
     return df
 
 
@@ -18,8 +21,7 @@ def test_detect_bullish_engulfing() -> None:
         {"open": 99.9, "close": 102.0, "high": 102.5, "low": 99.5, "volume": 120},
     ]
     df = _df_from_rows(rows)
-    detector = PatternDetector()
-    assert detector.detect_bullish_engulfing(df) is True
+    assert DETECTOR.detect_bullish_engulfing(df) is True
 
 
 def test_detect_bearish_engulfing() -> None:
@@ -28,8 +30,7 @@ def test_detect_bearish_engulfing() -> None:
         {"open": 101.4, "close": 99.6, "high": 101.6, "low": 99.4, "volume": 110},
     ]
     df = _df_from_rows(rows)
-    detector = PatternDetector()
-    assert detector.detect_bearish_engulfing(df) is True
+    assert DETECTOR.detect_bearish_engulfing(df) is True
 
 
 def test_detect_three_consecutive_bullish() -> None:
@@ -39,8 +40,7 @@ def test_detect_three_consecutive_bullish() -> None:
         {"open": 101.0, "close": 101.6, "high": 101.8, "low": 100.9, "volume": 140},
     ]
     df = _df_from_rows(rows)
-    detector = PatternDetector()
-    assert detector.detect_three_consecutive(df, "bullish") is True
+    assert DETECTOR.detect_three_consecutive(df, "bullish") is True
 
 
 def test_get_all_patterns_returns_score_and_labels() -> None:
@@ -50,8 +50,34 @@ def test_get_all_patterns_returns_score_and_labels() -> None:
         {"open": 101.0, "close": 101.5, "high": 101.7, "low": 100.8, "volume": 160},
     ]
     df = _df_from_rows(rows)
-    detector = PatternDetector()
-    result = detector.get_all_patterns(df, support_zone=99.5)
+    result = DETECTOR.get_all_patterns(df, support_zone=99.5)
 
     assert "engulfing" in result["bullish"]
     assert result["score"] == 10
+
+
+def test_get_all_patterns_cache_respects_subclass_overrides() -> None:
+    class NoEngulfingDetector(PatternDetector):
+        @staticmethod
+        def detect_bullish_engulfing(df: pd.DataFrame) -> bool:
+            return False
+
+    rows = [
+        {"open": 101.0, "close": 100.0, "high": 101.5, "low": 99.8, "volume": 100},
+        {"open": 99.9, "close": 102.0, "high": 102.5, "low": 99.5, "volume": 120},
+    ]
+    df = _df_from_rows(rows)
+
+    assert "engulfing" in DETECTOR.get_all_patterns(df)["bullish"]
+    assert "engulfing" not in NoEngulfingDetector().get_all_patterns(df)["bullish"]
+
+
+def test_get_all_patterns_accepts_frames_without_volume() -> None:
+    rows = [
+        {"open": 101.0, "close": 100.0, "high": 101.5, "low": 99.8},
+        {"open": 99.9, "close": 102.0, "high": 102.5, "low": 99.5},
+    ]
+    result = DETECTOR.get_all_patterns(_df_from_rows(rows))
+
+    assert result["bullish"] == ["engulfing"]
+    assert result["score"] == 10
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
 import numpy as np
 import pandas as pd
 import pytest
-from typing import Callable
 
+from data.data_storage import DataStorage
+from indicators.market_structure import MarketStructure
+from signals.btc_filter import BTCFilter
 from signals.signal_engine import SignalEngine
 
 
 def _make_df(values: dict[str, list[float]], symbol: str, timeframe: str, freq: str) -> pd.DataFrame:
     length = len(next(iter(values.values())))
     index = pd.date_range("2024-01-01", periods=length, freq=freq, tz="UTC")
-    df = pd.DataFrame(values, index=index)
-    df["datetime"] = index
-    df["timestamp"] = (index.astype("int64") // 10**9).astype(int)
+    arrays = {name: np.asarray(column, dtype=np.float64) for name, column in values.items()}
+    df = pd.DataFrame(arrays, index=index, copy=False)
+    df["timestamp"] = index.asi8 // 1_000_000_000
     df.attrs["symbol"] = symbol
     df.attrs["timeframe"] = timeframe
     return df
@@ -83,21 +90,53 @@ def _eth_1h() -> pd.DataFrame:
     return _make_df(values, "ETH/USDT", "1h", "H")
 
 
-@pytest.fixture()
-def engine(monkeypatch: pytest.MonkeyPatch) -> SignalEngine:
-    engine = SignalEngine()
+_SR_MAP: dict[str, dict[str, object]] = {
+    "BTC/USDT": {
+        "supports": [{"price": 25800.0, "touches": 3, "strength": "strong"}],
+        "resistances": [{"price": 27000.0, "touches": 2, "strength": "medium"}],
+    },
+    "ETH/USDT": {
+        "supports": [{"price": 100.0, "touches": 3, "strength": "strong"}],
+        "resistances": [{"price": 105.0, "touches": 2, "strength": "medium"}],
+    },
+}
+
+_TREND_MAP: dict[str, dict[str, object]] = {
+    "BTC/USDT": {
+        "trend": "ALCISTA_FUERTE",
+        "trend_strength": 70,
+        "structure": "HH/HL",
+        "ema_alignment": True,
+        "adx_value": 32,
+    },
+    "ETH/USDT": {
+        "trend": "ALCISTA_FUERTE",
+        "trend_strength": 65,
+        "structure": "HH/HL",
+        "ema_alignment": True,
+        "adx_value": 30,
+    },
+}
 
-    builders: dict[tuple[str, str], Callable[[], pd.DataFrame]] = {
-        ("BTC/USDT", "4h"): _btc_4h,
-        ("BTC/USDT", "1h"): _btc_1h,
-        ("ETH/USDT", "4h"): _eth_4h,
-        ("ETH/USDT", "1h"): _eth_1h,
+
+@pytest.fixture(scope="session")
+def market_frames() -> dict[tuple[str, str], pd.DataFrame]:
+    return {
+        ("BTC/USDT", "4h"): _btc_4h(),
+        ("BTC/USDT", "1h"): _btc_1h(),
+        ("ETH/USDT", "4h"): _eth_4h(),
+        ("ETH/USDT", "1h"): _eth_1h(),
     }
 
+
+@pytest.fixture()
+def engine(monkeypatch: pytest.MonkeyPatch, market_frames: dict[tuple[str, str], pd.DataFrame]) -> SignalEngine:
+    # El engine guarda cachés por instancia, así que se crea por test; los DataFrames se comparten
+    # (el engine no modifica los frames cargados).
+    engine = SignalEngine()
+
     def fake_load(symbol: str, timeframe: str, limit: int = 200) -> pd.DataFrame:
-        builder = builders[(symbol, timeframe)]
-        df = builder()
-        return df
+        return market_frames[(symbol, timeframe)]
 
     monkeypatch.setattr(engine, "_load_and_prepare_data", fake_load)
 
@@ -111,50 +150,14 @@ def engine(monkeypatch: pytest.MonkeyPatch) -> SignalEngine:
 
     monkeypatch.setattr(engine, "_load_cvd_series", fake_cvd)
 
-    sr_map = {
-        "BTC/USDT": {
-            "supports": [{"price": 25800.0, "touches": 3, "strength": "strong"}],
-            "resistances": [{"price": 27000.0, "touches": 2, "strength": "medium"}],
-        },
-        "ETH/USDT": {
-            "supports": [{"price": 100.0, "touches": 3, "strength": "strong"}],
-            "resistances": [{"price": 105.0, "touches": 2, "strength": "medium"}],
-        },
-    }
-
-    trend_map = {
-        "BTC/USDT": {
-            "trend": "ALCISTA_FUERTE",
-            "trend_strength": 70,
-            "structure": "HH/HL",
-            "ema_alignment": True,
-            "adx_value": 32,
-        },
-        "ETH/USDT": {
-            "trend": "ALCISTA_FUERTE",
-            "trend_strength": 65,
-            "structure": "HH/HL",
-            "ema_alignment": True,
-            "adx_value": 30,
-        },
-    }
-
-    class StubMarketStructure:
-        @staticmethod
-        def detect_swing_points(df: pd.DataFrame) -> pd.DataFrame:
-            return df
-
-        @staticmethod
-        def identify_support_resistance(df: pd.DataFrame) -> dict[str, object]:
-            symbol = df.attrs["symbol"]
-            return sr_map[symbol]
-
-        @staticmethod
-        def determine_trend(df: pd.DataFrame) -> dict[str, object]:
-            symbol = df.attrs["symbol"]
-            return trend_map[symbol]
-
-    engine.market_structure = StubMarketStructure()
+    # Resultados resueltos por frame al montar el fixture: el stub no consulta df.attrs en cada llamada.
+    sr_by_frame = {id(df): _SR_MAP[symbol] for (symbol, _), df in market_frames.items()}
+    trend_by_frame = {id(df): _TREND_MAP[symbol] for (symbol, _), df in market_frames.items()}
+    engine.market_structure = SimpleNamespace(
+        detect_swing_points=lambda df: df,
+        identify_support_resistance=lambda df: sr_by_frame[id(df)],
+        determine_trend=lambda df: trend_by_frame[id(df)],
+    )
 
     btc_context = {
         "trend": "ALCISTA_FUERTE",
@@ -189,3 +192,139 @@ def test_scan_for_signals_produces_long_signal(engine: SignalEngine) -> None:
     assert signal.confluence["count"] >= 0
     assert "structure" in signal.base_components
     assert "TP1" in signal.to_alert_string()
+
+
+def test_load_and_prepare_data_recomputes_when_last_candle_is_upserted(tmp_path: Path) -> None:
+    engine = SignalEngine()
+    engine.storage = DataStorage(str(tmp_path / "ohlcv.db"))
+    close = np.linspace(100.0, 110.0, 60)
+    candles = pd.DataFrame(
+        {
+            "timestamp": np.arange(60) * 3600,
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(60, 10.0),
+        }
+    )
+    engine.storage.save_ohlcv(candles, "ETH/USDT", "1h")
+
+    first = engine._load_and_prepare_data("ETH/USDT", "1h")
+    assert engine._load_and_prepare_data("ETH/USDT", "1h") is first
+
+    # La vela en formación se reescribe con el mismo timestamp.
+    candles.loc[59, ["high", "close"]] = 150.0
+    engine.storage.save_ohlcv(candles.tail(1), "ETH/USDT", "1h")
+
+    refreshed = engine._load_and_prepare_data("ETH/USDT", "1h")
+    assert refreshed is not first
+    assert refreshed["close"].iloc[-1] == 150.0
+
+
+def test_levels_cache_follows_upserted_last_candle(engine: SignalEngine, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(engine, "_compute_key_levels", lambda df: {"sessions": {}})
+    df = _eth_1h()
+    first_levels, first_context = engine._get_or_compute_levels("ETH/USDT", df)
+    assert engine._key_levels_cache["ETH/USDT"]["indicator_context"] == first_context
+
+    updated = df.copy()
+    updated.iloc[-1, updated.columns.get_loc("vwap")] = 120.0
+    updated.iloc[-1, updated.columns.get_loc("close")] = 121.0
+    _, context = engine._get_or_compute_levels("ETH/USDT", updated)
+
+    assert context["vwap"] == 120.0
+    assert first_context["vwap"] != 120.0
+
+
+def test_scan_pool_is_reused_until_closed(tmp_path: Path) -> None:
+    engine = SignalEngine(max_workers=2, key_levels_cache_dir=str(tmp_path))
+
+    pool = engine._get_pool()
+    assert engine._get_pool() is pool
+    assert pool._initargs == (str(tmp_path),)
+
+    engine.close()
+    assert engine._pool is None
+    assert engine._get_pool() is not pool
+    engine.close()
+
+
+def test_get_last_indicator_falls_back_to_last_valid_value() -> None:
+    df = pd.DataFrame({"atr": [1.0, 2.0, np.nan], "rsi": [np.nan, np.nan, np.nan], "adx": [10.0, 11.0, 12.0]})
+
+    assert SignalEngine._get_last_indicator(df, "atr") == 2.0
+    assert SignalEngine._get_last_indicator(df, "adx") == 12.0
+    assert np.isnan(SignalEngine._get_last_indicator(df, "rsi"))
+    assert np.isnan(SignalEngine._get_last_indicator(df, "missing"))
+
+
+_BTC_CONTEXT: dict[str, object] = {
+    "trend": "ALCISTA_FUERTE",
+    "trend_strength": 70,
+    "volatility": "NORMAL",
+    "session_quality": "ALTA",
+    "multiplier_long": 1.2,
+    "multiplier_short": 0.3,
+    "should_trade": True,
+    "current_price": 26600.0,
+    "atr": 120.0,
+    "adx": 32.0,
+}
+
+
+@pytest.fixture()
+def class_stubbed_market(monkeypatch: pytest.MonkeyPatch, market_frames: dict[tuple[str, str], pd.DataFrame]) -> None:
+    # Los workers del pool crean su propio engine: los stubs van a nivel de clase y llegan a ellos por fork.
+    def fake_load(self: SignalEngine, symbol: str, timeframe: str, limit: int = 200) -> pd.DataFrame:
+        return market_frames[(symbol, timeframe)]
+
+    def fake_cvd(self: SignalEngine, symbol: str, timeframe: str, timestamps: pd.Series) -> np.ndarray:
+        multiplier = 20.0 if timeframe == "1h" else 5.0
+        return np.arange(len(timestamps), dtype=float) * multiplier
+
+    monkeypatch.setattr(SignalEngine, "_load_and_prepare_data", fake_load)
+    monkeypatch.setattr(SignalEngine, "_load_cvd_series", fake_cvd)
+    monkeypatch.setattr(SignalEngine, "_compute_key_levels", lambda self, df: {"sessions": {}})
+    monkeypatch.setattr(MarketStructure, "detect_swing_points", lambda self, df: df)
+    monkeypatch.setattr(MarketStructure, "identify_support_resistance", lambda self, df: _SR_MAP[df.attrs["symbol"]])
+    monkeypatch.setattr(MarketStructure, "determine_trend", lambda self, df: _TREND_MAP[df.attrs["symbol"]])
+    monkeypatch.setattr(BTCFilter, "analyze_btc_context", lambda self, df4h, df1h: _BTC_CONTEXT)
+
+
+requires_fork = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="los stubs de clase solo llegan a los workers por fork"
+)
+
+def _comparable(signals: list) -> list[dict[str, object]]:
+    return [{k: v for k, v in vars(s).items() if k not in {"timestamp", "valid_until"}} for s in signals]
+
+
+@requires_fork
+@pytest.mark.usefixtures("class_stubbed_market")
+def test_scan_for_signals_pool_matches_serial() -> None:
+    symbols = ["ETH/USDT", "BTC/USDT"]
+    serial = SignalEngine(max_workers=1, key_levels_cache_dir="").scan_for_signals(symbols)
+
+    engine = SignalEngine(max_workers=2, key_levels_cache_dir="")
+    try:
+        parallel = engine.scan_for_signals(symbols)
+        again = engine.scan_for_signals(symbols)
+    finally:
+        engine.close()
+
+    assert serial
+    assert _comparable(parallel) == _comparable(serial)
+    assert _comparable(again) == _comparable(serial)
+
+
+@requires_fork
+@pytest.mark.usefixtures("class_stubbed_market")
+def test_scan_for_signals_drops_broken_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(SignalEngine, "_scan_symbol", lambda self, symbol, btc_context: os._exit(1))
+    engine = SignalEngine(max_workers=2, key_levels_cache_dir="")
+    try:
+        assert engine.scan_for_signals(["ETH/USDT", "BTC/USDT"]) == []
+        assert engine._pool is None
+    finally:
+        engine.close()
@@ -1,28 +1,17 @@
 from __future__ import annotations
 
+from typing import Callable
+
 import numpy as np
 import pandas as pd
-from pandas.testing import assert_series_equal
-
-from indicators.technical_indicators import TechnicalIndicators
-
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
 
-def _sample_ohlcv(rows: int = 10) -> pd.DataFrame:
-    base = pd.date_range("2024-01-01", periods=rows, freq="H", tz="UTC")
-    data = {
-        "open": np.linspace(100, 110, rows),
-        "high": np.linspace(101, 112, rows),
-        "low": np.linspace(99, 108, rows),
-        "close": np.linspace(100, 111, rows),
-        "volume": np.linspace(10, 20, rows),
-    }
-    df = pd.DataFrame(data, index=base)
-    df["datetime"] = base
-    return df
+from indicators.technical_indicators import TechnicalIndicators, _adx_core
 
 
-def test_calculate_ema_matches_pandas() -> None:
-    df = _sample_ohlcv(6)
+def test_calculate_ema_matches_pandas(sample_ohlcv_factory: Callable[[int], pd.DataFrame]) -> None:
+    df = sample_ohlcv_factory(6)
     period = 3
 
     ema = TechnicalIndicators.calculate_ema(df, period)
@@ -31,14 +20,44 @@ def test_calculate_ema_matches_pandas() -> None:
     assert_series_equal(ema, expected)
 
 
-def test_calculate_atr_expected_values() -> None:
-    df = pd.DataFrame(
+def _ewm_adjust_false(values: np.ndarray, alpha: float) -> np.ndarray:
+    """NumPy oracle for ``ewm(alpha=alpha, adjust=False).mean()`` on a series without gaps."""
+    result = np.empty(len(values))
+    result[0] = values[0]
+    for i in range(1, len(values)):
+        result[i] = (1 - alpha) * result[i - 1] + alpha * values[i]
+    return result
+
+
+def _atr_frame() -> pd.DataFrame:
+    return pd.DataFrame(
         {
             "high": [10, 12, 13, 14, 15],
             "low": [8, 9, 10, 11, 13],
             "close": [9, 11, 12, 13, 14],
         }
     )
+
+
+def test_calculate_atr_expected_values() -> None:
+    df = _atr_frame()
+    period = 3
+
+    atr = TechnicalIndicators.calculate_atr(df, period)
+
+    high, low, close = (df[col].to_numpy(dtype=float) for col in ("high", "low", "close"))
+    true_range = high - low
+    true_range[1:] = np.maximum(
+        np.maximum(true_range[1:], np.abs(high[1:] - close[:-1])), np.abs(low[1:] - close[:-1])
+    )
+    expected = _ewm_adjust_false(true_range, 1 / period)
+
+    np.testing.assert_allclose(atr.to_numpy(), expected, atol=1e-12)
+
+
+@pytest.mark.slow
+def test_calculate_atr_matches_pandas_oracle() -> None:
+    df = _atr_frame()
     period = 3
 
     atr = TechnicalIndicators.calculate_atr(df, period)
@@ -53,35 +72,82 @@ def test_calculate_atr_expected_values() -> None:
     assert_series_equal(atr, expected)
 
 
-def test_calculate_adx_returns_valid_dataframe() -> None:
-    df = _sample_ohlcv(20)
+def test_calculate_adx_returns_valid_dataframe(sample_ohlcv_factory: Callable[[int], pd.DataFrame]) -> None:
+    df = sample_ohlcv_factory(20)
     adx_df = TechnicalIndicators.calculate_adx(df, period=5)
 
     assert set(adx_df.columns) == {"adx", "plus_di", "minus_di"}
     assert len(adx_df) == len(df)
-    assert (adx_df[["adx", "plus_di", "minus_di"]].values >= 0).all()
-    assert (adx_df[["adx", "plus_di", "minus_di"]].values <= 100).all()
+    values = adx_df[["adx", "plus_di", "minus_di"]].to_numpy()
+    assert ((values >= 0) & (values <= 100)).all()
     assert adx_df["adx"].iloc[-1] >= 0
 
 
+def _adx_pandas_oracle(df: pd.DataFrame, period: int) -> pd.DataFrame:
+    alpha = 1 / period
+    up_move = df["high"].diff()
+    down_move = df["low"].shift(1) - df["low"]
+    plus_dm = pd.Series(np.where((up_move > down_move) & (up_move > 0), up_move, 0.0), index=df.index)
+    minus_dm = pd.Series(np.where((down_move > up_move) & (down_move > 0), down_move, 0.0), index=df.index)
+
+    prev_close = df["close"].shift(1)
+    true_range = pd.concat(
+        [df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()], axis=1
+    ).max(axis=1)
+    atr = true_range.ewm(alpha=alpha, adjust=False).mean()
+
+    def finite_or_zero(series: pd.Series) -> pd.Series:
+        return series.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+    plus_di = finite_or_zero(100 * plus_dm.ewm(alpha=alpha, adjust=False).mean() / atr)
+    minus_di = finite_or_zero(100 * minus_dm.ewm(alpha=alpha, adjust=False).mean() / atr)
+    dx = finite_or_zero((plus_di - minus_di).abs() / (plus_di + minus_di) * 100)
+    adx = dx.ewm(alpha=alpha, adjust=False).mean()
+    return pd.DataFrame(
+        {
+            "adx": adx.clip(lower=0, upper=100),
+            "plus_di": plus_di.clip(lower=0, upper=100),
+            "minus_di": minus_di.clip(lower=0, upper=100),
+        }
+    )
+
+
+def test_calculate_adx_kernel_matches_pandas_oracle() -> None:
+    rng = np.random.default_rng(7)
+    close = 100 + rng.normal(0, 1, 300).cumsum()
+    df = pd.DataFrame({"high": close + rng.random(300), "low": close - rng.random(300), "close": close})
+    # Flat stretch: exercises the zero-ATR and zero-DI-sum guards.
+    df.iloc[100:120] = 50.0
+
+    adx_df = TechnicalIndicators.calculate_adx(df, period=14)
+
+    assert_frame_equal(adx_df, _adx_pandas_oracle(df, 14), check_exact=False, rtol=1e-9, atol=1e-9)
+
+    arrays = [df[col].to_numpy(dtype=float) for col in ("high", "low", "close")]
+    compiled = _adx_core(*arrays, 14)
+    interpreted = getattr(_adx_core, "py_func", _adx_core)(*arrays, 14)
+    for compiled_values, interpreted_values in zip(compiled, interpreted):
+        np.testing.assert_allclose(compiled_values, interpreted_values, rtol=1e-12, atol=1e-12)
+
+
 def test_calculate_rsi_within_bounds() -> None:
     df = pd.DataFrame({"close": [100, 102, 104, 103, 105, 104, 106, 108]})
     rsi = TechnicalIndicators.calculate_rsi(df, period=3)
 
-    assert ((rsi >= 0) & (rsi <= 100)).all()
+    # The first bar has no previous close, so its RSI is NaN.
+    assert np.isnan(rsi.iloc[0])
+    bounded = rsi.dropna()
+    assert ((bounded >= 0) & (bounded <= 100)).all()
 
-    delta = df["close"].diff()
-    gains = delta.clip(lower=0)
-    losses = -delta.clip(upper=0)
-    avg_gain = gains.ewm(alpha=1 / 3, adjust=False).mean()
-    avg_loss = losses.ewm(alpha=1 / 3, adjust=False).mean()
-    rs = avg_gain / avg_loss.replace(0, np.nan)
-    expected = 100 - (100 / (1 + rs))
-    expected = expected.where(~avg_loss.eq(0), 100)
-    both_zero = avg_gain.eq(0) & avg_loss.eq(0)
-    expected = expected.where(~both_zero, 50).clip(lower=0, upper=100)
+    delta = np.diff(df["close"].to_numpy(dtype=float))
+    avg_gain = _ewm_adjust_false(np.clip(delta, 0, None), 1 / 3)
+    avg_loss = _ewm_adjust_false(-np.clip(delta, None, 0), 1 / 3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = 100 - 100 / (1 + avg_gain / avg_loss)
+    expected = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), expected)
+    expected = np.concatenate(([np.nan], np.clip(expected, 0, 100)))
 
-    assert_series_equal(rsi, expected)
+    np.testing.assert_allclose(rsi.to_numpy(), expected, atol=1e-12)
 
 
 def test_calculate_vwap_matches_manual() -> None:
@@ -125,7 +191,6 @@ def test_calculate_session_vwap_resets_each_day() -> None:
         },
         index=idx,
     )
-    df["datetime"] = idx
 
     session_vwap = TechnicalIndicators.calculate_session_vwap(df, session_start_hour=0)
     typical_price = (df["high"] + df["low"] + df["close"]) / 3
@@ -137,11 +202,24 @@ def test_calculate_session_vwap_resets_each_day() -> None:
     assert session_vwap.iloc[1] > session_vwap.iloc[0]
 
 
-def test_add_all_indicators_appends_columns() -> None:
-    df = _sample_ohlcv(30)
+def test_add_all_indicators_appends_columns(sample_ohlcv_factory: Callable[[int], pd.DataFrame]) -> None:
+    df = sample_ohlcv_factory(30)
     ti = TechnicalIndicators()
     enriched = ti.add_all_indicators(df)
 
     expected_columns = {"ema_20", "ema_50", "atr", "adx", "plus_di", "minus_di", "rsi", "vwap"}
     assert expected_columns.issubset(set(enriched.columns))
     assert len(enriched) == len(df)
+
+
+def test_add_all_indicators_downcasts_when_requested(sample_ohlcv_factory: Callable[[int], pd.DataFrame]) -> None:
+    df = sample_ohlcv_factory(30)
+    ti = TechnicalIndicators()
+    full = ti.add_all_indicators(df)
+    compact = ti.add_all_indicators(df, float_dtype="float32")
+
+    indicator_columns = compact.columns.difference(df.columns)
+    assert (compact[indicator_columns].dtypes == np.float32).all()
+    assert (compact[df.select_dtypes("float64").columns].dtypes == np.float64).all()
+    pd.testing.assert_frame_equal(compact[df.columns], df)
+    pd.testing.assert_frame_equal(compact, full, check_dtype=False, check_exact=False, rtol=1e-6)
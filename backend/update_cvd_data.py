@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+
 from src.config import settings
 from src.data.cvd_calculator import CVDCalculator
 from src.data.cvd_storage import CVDStorage
@@ -12,36 +17,88 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def update_cvd_for_all_assets(limit: int = 200) -> None:
-    cvd_calculator = CVDCalculator()
+# Número de símbolos cuyos CVD se acumulan antes de escribirlos en una sola transacción.
+FLUSH_EVERY_SYMBOLS = 10
+
+_worker_calculator: Optional[CVDCalculator] = None
+_worker_storage: Optional[DataStorage] = None
+
+
+def _init_cvd_worker() -> None:
+    global _worker_calculator, _worker_storage
+    _worker_calculator = CVDCalculator()
+    _worker_storage = DataStorage(settings.DB_PATH)
+
+
+def _compute_one(symbol: str, timeframe: str, limit: int) -> Optional[Dict[str, object]]:
+    """Calcula el CVD de un par símbolo/timeframe y devuelve el payload para ``save_cvd_bulk``."""
+    if _worker_calculator is None or _worker_storage is None:
+        _init_cvd_worker()
+    assert _worker_calculator is not None and _worker_storage is not None
+
+    logger.info("Updating CVD for %s @ %s", symbol, timeframe)
+    candles = _worker_storage.get_ohlcv(symbol, timeframe, limit)
+    if candles.empty:
+        logger.warning("No OHLCV data for %s @ %s", symbol, timeframe)
+        return None
+
+    cvd_period = _worker_calculator.calculate_cvd_for_candles(symbol, timeframe, candles)
+    cvd_cumulative = _worker_calculator.calculate_cumulative_cvd(cvd_period)
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "timestamps": candles["timestamp"].to_numpy(dtype=np.int64),
+        "cvd_period": np.asarray(cvd_period, dtype=np.float64),
+        "cvd_cumulative": cvd_cumulative,
+    }
+
+
+def update_cvd_for_all_assets(limit: int = 200, max_workers: Optional[int] = None) -> None:
     cvd_storage = CVDStorage()
-    ohlcv_storage = DataStorage(settings.DB_PATH)
+    tasks = [(symbol, timeframe) for symbol in settings.SYMBOLS for timeframe in settings.TIMEFRAMES]
+    flush_every = FLUSH_EVERY_SYMBOLS * max(1, len(settings.TIMEFRAMES))
+    pending: List[Dict[str, object]] = []
+
+    def flush() -> None:
+        if not pending:
+            return
+        try:
+            cvd_storage.save_cvd_bulk(pending)
+            logger.info("CVD updated successfully for %s series", len(pending))
+        except Exception as exc:  # pragma: no cover - runtime safety
+            logger.error("Failed to store CVD batch of %s series: %s", len(pending), exc)
+        pending.clear()
 
-    for symbol in settings.SYMBOLS:
-        for timeframe in settings.TIMEFRAMES:
-            logger.info("Updating CVD for %s @ %s", symbol, timeframe)
+    def collect(payload: Optional[Dict[str, object]]) -> None:
+        if payload is None:
+            return
+        pending.append(payload)
+        if len(pending) >= flush_every:
+            flush()
 
+    workers = min(max(1, max_workers if max_workers is not None else settings.CVD_WORKERS), len(tasks))
+    if workers > 1:
+        # Los cálculos se reparten entre procesos; SQLite solo se escribe desde el proceso principal.
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_cvd_worker) as pool:
+            futures = {
+                pool.submit(_compute_one, symbol, timeframe, limit): (symbol, timeframe)
+                for symbol, timeframe in tasks
+            }
+            for future in as_completed(futures):
+                symbol, timeframe = futures[future]
+                try:
+                    collect(future.result())
+                except Exception as exc:  # pragma: no cover - runtime safety
+                    logger.error("Failed to update CVD for %s @ %s: %s", symbol, timeframe, exc)
+    else:
+        for symbol, timeframe in tasks:
             try:
-                candles = ohlcv_storage.get_ohlcv(symbol, timeframe, limit)
-                if candles.empty:
-                    logger.warning("No OHLCV data for %s @ %s", symbol, timeframe)
-                    continue
-
-                cvd_period = cvd_calculator.calculate_cvd_for_candles(symbol, timeframe, candles)
-                cvd_cumulative = cvd_calculator.calculate_cumulative_cvd(cvd_period)
-
-                cvd_storage.save_cvd(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    timestamps=candles["timestamp"].astype(int).tolist(),
-                    cvd_period=cvd_period.astype(float).tolist(),
-                    cvd_cumulative=cvd_cumulative.astype(float).tolist(),
-                )
-
-                logger.info("CVD updated successfully for %s @ %s", symbol, timeframe)
+                collect(_compute_one(symbol, timeframe, limit))
             except Exception as exc:  # pragma: no cover - runtime safety
                 logger.error("Failed to update CVD for %s @ %s: %s", symbol, timeframe, exc)
 
+    flush()
+
 
 if __name__ == "__main__":
     logger.info("Starting CVD update job")